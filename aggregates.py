@@ -0,0 +1,158 @@
+from typing import Iterable, Optional
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from schema import movie_genres_table, movies_table
+
+# Numeric columns summarised per genre
+METRICS = ('Rating', 'Votes', 'Duration')
+# Table holding the persisted per-genre summary
+SUMMARY_TABLE = 'genre_summary'
+
+_STATS = ('count', 'sum', 'min', 'max')
+
+
+class GenreAggregates:
+    """
+    Per-genre count, sum, min and max of every metric, computed in one pass.
+
+    Every movie is counted once per genre. Means are derived from sums and
+    counts. The summary is stored next to the data it describes, and when
+    some movies change only the summary of their genres is recomputed.
+    """
+
+    def __init__(self, stats: pd.DataFrame):
+        self.stats = stats
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "GenreAggregates":
+        """
+        Summarise a movie DataFrame with a single groupby over 'Genre'.
+
+        Args:
+            df: Movie data with a 'Genre' column and the METRICS columns.
+
+        Returns:
+            GenreAggregates: The per-genre summary.
+        """
+        # Accumulate float32 columns in float64 so means do not drift
+        df = df.astype({metric: 'float64' for metric in METRICS
+                        if df[metric].dtype == 'float32'})
+        named = {'movies': ('Genre', 'size')}
+        for metric in METRICS:
+            for stat in _STATS:
+                named[f'{metric}_{stat}'] = (metric, stat)
+        stats = df.groupby('Genre', observed=True, sort=True).agg(**named)
+        return cls(stats)
+
+    @classmethod
+    def from_database(cls, conn: Connection,
+                      genres: Optional[Iterable[str]] = None) -> "GenreAggregates":
+        """
+        Summarise the normalized movies and movie_genres tables with a
+        single GROUP BY, run by the database.
+
+        Args:
+            conn: A connection to the movie database.
+            genres: Only summarise these genres; all genres by default.
+
+        Returns:
+            GenreAggregates: The per-genre summary.
+        """
+        movies, links = movies_table, movie_genres_table
+        columns = [links.c['Genre'], func.count().label('movies')]
+        for metric in METRICS:
+            for stat in _STATS:
+                columns.append(getattr(func, stat)(movies.c[metric]).label(f'{metric}_{stat}'))
+        stmt = (select(*columns)
+                .join_from(links, movies, links.c['movie_id'] == movies.c['movie_id'])
+                .group_by(links.c['Genre']).order_by(links.c['Genre']))
+        if genres is not None:
+            stmt = stmt.where(links.c['Genre'].in_(sorted(set(genres))))
+        stats = pd.read_sql(stmt, conn).set_index('Genre')
+        # MySQL returns sums as Decimal
+        return cls(stats.astype({column: 'float64' for column in stats.columns
+                                 if column.rsplit('_', 1)[-1] in ('sum', 'min', 'max')}))
+
+    def replace(self, genres: Iterable[str], fresh: "GenreAggregates") -> "GenreAggregates":
+        """
+        Swap in a recomputed summary of some genres, e.g. after their movies changed.
+
+        Args:
+            genres: The recomputed genres; those missing from `fresh` no
+                longer have any movie and are dropped.
+            fresh: The summary of `genres`.
+
+        Returns:
+            GenreAggregates: The summary of every genre.
+        """
+        kept = self.stats.drop(index=list(genres), errors='ignore')
+        return GenreAggregates(pd.concat([kept, fresh.stats]).sort_index()[self.stats.columns])
+
+    @property
+    def genres(self) -> pd.Index:
+        return self.stats.index
+
+    def counts(self) -> pd.Series:
+        """
+        Returns:
+            pd.Series: Number of movies per genre, sorted by genre.
+        """
+        return self.stats['movies'].rename('count')
+
+    def mean(self, metric: str) -> pd.Series:
+        """
+        Args:
+            metric: One of METRICS.
+
+        Returns:
+            pd.Series: The average of `metric` per genre, ignoring nulls.
+        """
+        mean = self.stats[f'{metric}_sum'] / self.stats[f'{metric}_count']
+        return mean.rename(metric)
+
+    def minimum(self, metric: str) -> pd.Series:
+        return self.stats[f'{metric}_min'].rename(metric)
+
+    def maximum(self, metric: str) -> pd.Series:
+        return self.stats[f'{metric}_max'].rename(metric)
+
+    def persist(self, engine: Engine, table: str = SUMMARY_TABLE,
+                batch_id: Optional[int] = None) -> None:
+        """
+        Store the summary in the database, replacing the previous one.
+
+        Args:
+            engine: The engine connected to the movie database.
+            table: The summary table name.
+            batch_id: The load batch the summary describes.
+        """
+        self.stats.reset_index().assign(batch_id=batch_id).to_sql(
+            table, engine, index=False, if_exists='replace'
+        )
+
+    @classmethod
+    def read(cls, engine: Engine, table: str = SUMMARY_TABLE,
+             batch_id: Optional[int] = None) -> Optional["GenreAggregates"]:
+        """
+        Load a summary previously stored with `persist`.
+
+        Args:
+            engine: The engine connected to the movie database.
+            table: The summary table name.
+            batch_id: Only accept the summary of this load batch.
+
+        Returns:
+            GenreAggregates or None: The stored summary, or None if missing
+            or stored for another batch.
+        """
+        try:
+            stats = pd.read_sql_table(table, engine)
+        except ValueError:
+            return None
+        stored_for = stats.pop('batch_id') if 'batch_id' in stats else None
+        if batch_id is not None and (stored_for is None or (stored_for != batch_id).any()):
+            return None
+        return cls(stats.set_index('Genre'))
@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from aggregates import GenreAggregates
+from data_layer import DataLayer
+from figures import draw_genre_counts, draw_genre_means, draw_scatter, render_figure
+from genres import GenreIndex
+from pipeline import CHUNK_SIZE, bulk_load
+from rankings import RankingIndex
+from schema import coerce_movie_data
+from title_search import TitleIndex
+
+# Dataset sizes (movie_data rows) benchmarked by default
+BENCHMARK_SIZES = (10_000, 1_000_000, 10_000_000)
+
+# Share of movies per genre in the scraped 2024 data (genre_df_cleaned.csv)
+GENRE_WEIGHTS = {
+    'Drama': 3081, 'Comedy': 1707, 'Action': 790, 'Crime': 576, 'Family': 342,
+    'War': 78, 'Western': 44, 'News': 3, 'Talk-Show': 2, 'Game-Show': 1,
+}
+# Share of movies listed under 1, 2 and 3 genres
+GENRES_PER_MOVIE = (0.6, 0.3, 0.1)
+# Share of movies whose runtime is missing
+MISSING_DURATION_SHARE = 0.03
+# Distinct words in the synthetic titles, used with Zipf-like frequencies
+TITLE_VOCABULARY = 50_000
+# Share of titles with 1, 2, 3 and 4 words
+WORDS_PER_TITLE = (0.2, 0.35, 0.3, 0.15)
+# Title lookups timed per run (prefixes, whole titles and misspellings)
+TITLE_QUERIES = 100
+
+
+def _titles(rng: np.random.Generator, count: int) -> np.ndarray:
+    # Made-up words of 1-3 syllables, a few very common and most rare
+    syllables = np.array([c + v for c in 'bcdfghklmnprstvz' for v in 'aeiou'])
+    words = syllables[rng.integers(len(syllables), size=TITLE_VOCABULARY)]
+    for share in (0.6, 0.3):
+        longer = np.char.add(words, syllables[rng.integers(len(syllables), size=TITLE_VOCABULARY)])
+        words = np.where(rng.random(TITLE_VOCABULARY) < share, longer, words)
+    words = np.char.capitalize(words)
+    frequency = 1 / np.arange(1, TITLE_VOCABULARY + 1)
+    lengths = rng.choice(len(WORDS_PER_TITLE), size=count, p=WORDS_PER_TITLE) + 1
+    picked = words[rng.choice(TITLE_VOCABULARY, size=(count, len(WORDS_PER_TITLE)),
+                              p=frequency / frequency.sum())]
+    titles = picked[:, 0]
+    for i in range(1, len(WORDS_PER_TITLE)):
+        titles = np.where(lengths > i, np.char.add(np.char.add(titles, ' '), picked[:, i]), titles)
+    return titles.astype(object)
+
+
+def generate_movie_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic movie_data table shaped like the scraped one.
+
+    Genres follow the skew of the real data and a movie may be listed
+    under several genres, with the same values on each of its rows. Votes
+    are log-normal (most movies have a few hundred, a handful millions),
+    ratings cluster around 6, and titles are one to four made-up words.
+
+    Args:
+        rows: Number of movie_data rows.
+        seed: Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: The rows, coerced to the compact movie_data schema.
+    """
+    rng = np.random.default_rng(seed)
+    genres = np.array(list(GENRE_WEIGHTS))
+    weights = np.array(list(GENRE_WEIGHTS.values()), dtype=float)
+    weights /= weights.sum()
+
+    # Enough movies for `rows` rows once (movie, genre) repeats are dropped
+    movies = int(rows / np.dot(GENRES_PER_MOVIE, [1, 2, 3]) * 1.1) + 1
+    per_movie = rng.choice([1, 2, 3], size=movies, p=GENRES_PER_MOVIE)
+    movie_ids = np.repeat(np.arange(movies), per_movie)
+    genre_codes = rng.choice(len(genres), size=len(movie_ids), p=weights)
+    pairs = np.unique(movie_ids.astype(np.int64) * len(genres) + genre_codes)[:rows]
+    movie_ids, genre_codes = np.divmod(pairs, len(genres))
+
+    votes = np.minimum(rng.lognormal(np.log(300), 2.2, movies), 3e6).astype(np.int64) + 5
+    rating = np.clip(np.round(rng.normal(6.2, 1.2, movies), 1), 1, 10)
+    duration = np.clip(rng.normal(105, 25, movies), 40, 250).round()
+    duration[rng.random(movies) < MISSING_DURATION_SHARE] = np.nan
+    titles = _titles(rng, movies)
+
+    return coerce_movie_data(pd.DataFrame({
+        'Movie Name': titles[movie_ids],
+        'Rating': rating[movie_ids],
+        'Votes': votes[movie_ids],
+        'Duration': duration[movie_ids],
+        'Genre': genres[genre_codes],
+    }))
+
+
+def _chunks(df: pd.DataFrame, chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def _title_queries(titles: pd.Series, count: int, seed: int = 0) -> List[str]:
+    # A third each of word prefixes, whole titles and titles with a letter dropped
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i, title in enumerate(titles.sample(count, random_state=seed)):
+        if i % 3 == 0:
+            queries.append(title.split()[0][:3])
+        elif i % 3 == 1:
+            queries.append(title)
+        else:
+            cut = int(rng.integers(1, len(title)))
+            queries.append(title[:cut] + title[cut + 1:])
+    return queries
+
+
+class StageTimer:
+    """Wall-clock seconds of named stages, keeping the best of repeated runs."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        self.seconds[name] = min(elapsed, self.seconds.get(name, elapsed))
+
+
+def _chart_draws(movies: pd.DataFrame, aggregates: GenreAggregates) -> dict:
+    # The charts of IMDB.py, with the same arguments
+    return {
+        'genre_distribution': lambda ax: draw_genre_counts(ax, aggregates.counts()),
+        'duration_vs_rating': lambda ax: draw_scatter(
+            ax, movies, "Duration", "Rating", "Movie Duration (minutes)", "Rating",
+            "Relationship between Movie Duration and Rating"),
+        'duration_vs_votes': lambda ax: draw_scatter(
+            ax, movies, "Duration", "Votes", "Movie Duration (minutes)", "Voting Count",
+            "Relationship between Movie Duration and voting count", log_y=True),
+        'votes_by_genre': lambda ax: draw_genre_means(
+            ax, aggregates.mean('Votes'), "Voting Count", "Voting Distribution by Genre"),
+        'rating_vs_votes': lambda ax: draw_scatter(
+            ax, movies, "Rating", "Votes", "Rating", "Voting Count",
+            "Relationship between Movie Rating and voting count", log_y=True),
+        'rating_by_genre': lambda ax: draw_genre_means(
+            ax, aggregates.mean('Rating'), "Rating", "Average Rating Distribution by Genre"),
+    }
+
+
+def benchmark_size(rows: int, url: str, repeat: int = 1, seed: int = 0) -> dict:
+    """
+    Load `rows` synthetic rows into the database and time every dashboard stage.
+
+    Args:
+        rows: Number of movie_data rows.
+        url: SQLAlchemy URL of the database to load into (its movie_data
+            table is replaced).
+        repeat: Runs of the dashboard stages; the fastest one is kept.
+        seed: Seed of the data generator.
+
+    Returns:
+        dict: The dataset size and the seconds taken by each stage.
+    """
+    timer = StageTimer()
+    with timer.stage('generate'):
+        data = generate_movie_data(rows, seed)
+    engine = create_engine(url)
+    with timer.stage('db_load'):
+        bulk_load(engine, _chunks(data))
+    del data
+
+    for _ in range(repeat):
+        layer = DataLayer(url=url, version_ttl=0, backend='database')
+        with timer.stage('data_load'):
+            df = layer.load()
+        with timer.stage('genre_index'):
+            index = GenreIndex.from_frame(df)
+        movies = index.movies
+
+        with timer.stage('filter_form'):
+            # Slider options are computed on every rerun, then the submitted filter runs
+            options = {column: sorted(movies[column].dropna().unique())
+                       for column in ('Rating', 'Duration', 'Votes')}
+            keep = index.matches(['Action', 'Drama'], 'any',
+                                 (options['Rating'][0], options['Rating'][-1]),
+                                 (options['Duration'][0], options['Duration'][-1]),
+                                 (options['Votes'][0], options['Votes'][-1]))
+            movies[keep]
+        with timer.stage('title_index'):
+            titles = TitleIndex.from_movies(movies)
+            # The trigram index behind misspelt words is built on first use
+            titles.similar_words('')
+        queries = _title_queries(movies['Movie Name'], TITLE_QUERIES, seed)
+        with timer.stage(f'title_search_x{TITLE_QUERIES}'):
+            for query in queries:
+                titles.search(query, mask=keep)
+        with timer.stage('aggregates'):
+            aggregates = GenreAggregates.from_frame(index.exploded())
+            for metric in ('Rating', 'Votes', 'Duration'):
+                aggregates.mean(metric)
+        with timer.stage('top5'):
+            rankings = RankingIndex.from_genre_index(index)
+            for metric in ('Duration', 'Votes', 'Rating'):
+                rankings.top(metric, 5)
+                rankings.top(metric, 5, ascending=True)
+        for chart_id, draw in _chart_draws(movies, aggregates).items():
+            with timer.stage(f'chart:{chart_id}'):
+                render_figure(draw)
+
+    return {
+        'rows': rows,
+        'movies': len(movies),
+        'backend': engine.dialect.name,
+        'seconds': timer.seconds,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: List[int], url: Optional[str] = None,
+                   repeat: int = 1, seed: int = 0) -> dict:
+    """
+    Benchmark every dataset size and collect the results with run metadata.
+
+    Args:
+        sizes: Numbers of movie_data rows.
+        url: Database to load into; a temporary SQLite file when omitted.
+        repeat: Runs of the dashboard stages per size.
+        seed: Seed of the data generator.
+
+    Returns:
+        dict: JSON-serializable results, one entry per size.
+    """
+    workdir = None
+    if url is None:
+        workdir = tempfile.mkdtemp(prefix='imdb-benchmark-')
+        url = f"sqlite:///{os.path.join(workdir, 'movies.db')}"
+    try:
+        results = []
+        for rows in sizes:
+            result = benchmark_size(rows, url, repeat, seed)
+            results.append(result)
+            print(f"{rows:>10} rows: " + ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in result['seconds'].items()
+            ))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'revision': _git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Time the dashboard stages on synthetic movie data."
+    )
+    parser.add_argument('--rows', type=int, nargs='+', default=list(BENCHMARK_SIZES),
+                        help="dataset sizes, in movie_data rows")
+    parser.add_argument('--db', help="SQLAlchemy URL to load into, e.g. a local "
+                                     "MySQL (default: a temporary SQLite file)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="runs per size; the fastest is reported")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json',
+                        help="JSON file to write the results to")
+    args = parser.parse_args()
+    report = run_benchmarks(args.rows, args.db, args.repeat, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
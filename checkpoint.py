@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+# Folder holding one CSV file per genre
+OUTPUT_DIR = "IMDB_2024_Genres_Data"
+# Folder holding the scraping checkpoints and the per-genre key stores
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, ".checkpoints")
+# Folder holding the new or changed movies not loaded into the database yet
+DELTA_DIR = os.path.join(OUTPUT_DIR, "delta")
+# Columns written to the genre CSV files
+CSV_COLUMNS = ["Movie Name", "Rating", "Votes", "Duration", "Genre"]
+# The delta files also keep the year, to merge the deltas of several runs by key
+DELTA_COLUMNS = CSV_COLUMNS + ["Year"]
+
+
+def _write_json(path, data):
+    # Write to a temporary file and move it into place, so a crash never leaves half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def checkpoint_name(url):
+    # Name a checkpoint after the genre in the URL, or a hash of the URL
+    genres = parse_qs(urlparse(url).query).get("genres")
+    if genres:
+        return genres[0]
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+
+
+def record_key(record):
+    # A movie is identified by its title and release year
+    return f"{record['Movie Name']}|{record.get('Year') or ''}"
+
+
+def _fingerprint(record):
+    # The scraped values whose change makes a movie part of the delta
+    return [record.get(column) for column in CSV_COLUMNS]
+
+
+@dataclass
+class ScrapeCheckpoint:
+    """
+    Progress of one genre page: how many items were loaded and saved so far.
+
+    The records of an unfinished page are appended to a JSON-lines file as
+    they are extracted, so a crashed run resumes from `items_loaded`.
+    """
+    url: str
+    items_loaded: int = 0
+    clicks: int = 0
+    completed: bool = False
+    updated_at: float = 0.0
+    directory: str = CHECKPOINT_DIR
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f"{checkpoint_name(self.url)}.json")
+
+    @property
+    def records_path(self):
+        return os.path.join(self.directory, f"{checkpoint_name(self.url)}.partial.jsonl")
+
+    @classmethod
+    def load(cls, url, directory=CHECKPOINT_DIR):
+        # Read the saved checkpoint of a URL, or start a new one
+        checkpoint = cls(url, directory=directory)
+        if os.path.exists(checkpoint.path):
+            with open(checkpoint.path, encoding="utf-8") as f:
+                saved = json.load(f)
+            saved.pop("directory", None)
+            checkpoint = cls(**saved, directory=directory)
+        return checkpoint
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.updated_at = time.time()
+        state = asdict(self)
+        state.pop("directory")
+        _write_json(self.path, state)
+
+    def restart(self):
+        # Start a new pass over the page (used to refresh a completed genre)
+        self.items_loaded = 0
+        self.clicks = 0
+        self.completed = False
+        if os.path.exists(self.records_path):
+            os.remove(self.records_path)
+
+    def append_records(self, records, items_loaded):
+        # Persist newly extracted records first, then the progress that covers them
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.items_loaded = items_loaded
+        self.save()
+
+    def read_records(self):
+        if not os.path.exists(self.records_path):
+            return []
+        with open(self.records_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def finish(self):
+        self.completed = True
+        self.save()
+        if os.path.exists(self.records_path):
+            os.remove(self.records_path)
+
+
+class GenreKeyStore:
+    """
+    The last scraped version of every movie of one genre, keyed on title + year.
+
+    Comparing a fresh scrape against it yields the new or changed movies
+    only, and the genre CSV file is rewritten from it.
+    """
+
+    def __init__(self, genre, directory=CHECKPOINT_DIR):
+        self.genre = genre
+        self.path = os.path.join(directory, f"{genre}.keys.json")
+        self.records = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.records = json.load(f)
+
+    def delta(self, records):
+        # Records that are new, or whose scraped values differ from the stored ones
+        changed = {}
+        for record in records:
+            key = record_key(record)
+            stored = self.records.get(key)
+            if stored is None or _fingerprint(stored) != _fingerprint(record):
+                changed[key] = record
+        return list(changed.values())
+
+    def update(self, records):
+        for record in records:
+            self.records[record_key(record)] = record
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_json(self.path, self.records)
+
+
+def apply_delta(genre_data, output_dir=OUTPUT_DIR, checkpoint_dir=CHECKPOINT_DIR):
+    """
+    Merge freshly scraped records into the stored genre data.
+
+    For each genre, only new or changed movies (by title + year) are kept:
+    they are added to '<output_dir>/delta/<genre>.csv' for the later stages, merged
+    into the key store, and the full '<genre>.csv' is rewritten from it.
+
+    A delta file accumulates the changes of every run until the loader
+    consumes and removes it (see pipeline.load_delta); a movie changed by
+    several runs is kept once, in its latest version.
+
+    Args:
+        genre_data: Scraped records grouped by genre.
+        output_dir: Folder of the genre CSV files.
+        checkpoint_dir: Folder of the key stores.
+
+    Returns:
+        dict: The new or changed records, grouped by genre.
+    """
+    delta_dir = os.path.join(output_dir, "delta")
+    os.makedirs(delta_dir, exist_ok=True)
+    deltas = {}
+    for genre, records in genre_data.items():
+        store = GenreKeyStore(genre, checkpoint_dir)
+        delta = store.delta(records)
+        delta_file = os.path.join(delta_dir, f"{genre}.csv")
+        pending = {}
+        if os.path.exists(delta_file):
+            stored = pd.read_csv(delta_file, dtype=str, keep_default_na=False)
+            pending = {record_key(record): record for record in stored.to_dict("records")}
+        pending.update((record_key(record), record) for record in delta)
+        pd.DataFrame(list(pending.values()), columns=DELTA_COLUMNS).to_csv(delta_file, index=False)
+        if delta:
+            store.update(delta)
+            deltas[genre] = delta
+        pd.DataFrame(list(store.records.values()), columns=CSV_COLUMNS).to_csv(
+            os.path.join(output_dir, f"{genre}.csv"), index=False
+        )
+        print(f"Genre '{genre}': {len(delta)} new or changed of {len(records)} movies")
+    return deltas
+
+
+# Save data to CSV files
+def genre_dataset(genre_data, output_dir=OUTPUT_DIR):
+    # Use os.makedirs to create the directory, with 'exist_ok=True' to avoid error if folder already exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Loop through the genre_data dictionary (which holds movie data categorized by genre)
+    for genre, movies in genre_data.items():
+        # Convert the list of movies (which is in dictionary format) to a pandas DataFrame
+        df = pd.DataFrame(movies, columns=CSV_COLUMNS)
+
+        # Create the file name by joining the output directory path with the genre name and .csv extension
+        file_name = os.path.join(output_dir, f"{genre}.csv")
+
+        # Save the DataFrame as a CSV file in the specified location, excluding the index column
+        df.to_csv(file_name, index=False)
+
+        # Print a confirmation message with the name of the genre and file that was created
+        print(f"Saved data for genre '{genre}' to '{file_name}'")
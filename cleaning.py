@@ -0,0 +1,299 @@
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import MOVIE_SCHEMA, coerce_movie_data
+
+# Scraped placeholders that mean "no value" rather than a malformed one
+MISSING_VALUES = frozenset({"", "N/A", "NA", "NAN", "NONE", "-"})
+
+# Vote counts as IMDb prints them: "850", "44K", "1.2M", optionally in
+# parentheses or with thousands separators (removed before matching)
+VOTES_PATTERN = r'^\(?(?P<number>\d+(?:\.\d+)?(?:E\d+)?)(?P<suffix>[KMB]?)\)?$'
+VOTES_SCALE = {'': 1, 'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+# Runtimes as IMDb prints them: "2h 7m", "2h", "45m" (spaces removed before
+# matching), or a plain number of minutes from already cleaned data
+DURATION_PATTERN = r'^(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M(?:IN)?)?$|^(?P<plain>\d+)$'
+# When IMDb lists no runtime, the certificate ("Not Rated", "TV-14", "16+")
+# shifts into the Duration slot: that is a missing runtime, not a bad one
+CERTIFICATE_PATTERN = r'^(?:NOTRATED|UNRATED|APPROVED|PASSED|[GMRX]|PG(?:-13)?|NC-17|TV-\w+|\d+\+)$'
+
+# Columns that a movie cannot be stored without
+REQUIRED_COLUMNS = ('Movie Name', 'Genre')
+
+
+@dataclass
+class CleanResult:
+    """
+    Cleaned movie rows, and the scraped rows that failed validation.
+
+    `rejected` holds the rejected rows as scraped, with a 'Reason' column
+    naming the fields that could not be parsed.
+    """
+    data: pd.DataFrame
+    rejected: pd.DataFrame
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    # Upper-case without blanks or thousands separators; placeholders become missing
+    text = values.astype(str).str.upper().str.replace(r'[\s,]', '', regex=True)
+    return text.where(~text.isin(MISSING_VALUES))
+
+
+def _parse_distinct(values: pd.Series, parse: Callable[[pd.Series], pd.Series],
+                    missing: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply a parser to the distinct values of a column only.
+
+    Scraped ratings, vote counts and runtimes repeat heavily ("1h 30m"
+    appears thousands of times), so parsing the distinct values and mapping
+    the results back by code does a fraction of the regex work.
+
+    Args:
+        values: The raw column.
+        parse: Maps normalized distinct strings to floats, NaN when invalid.
+        missing: Regex of normalized values that also mean "no value".
+
+    Returns:
+        tuple: The parsed values (float64, missing as NaN) and a boolean
+        mask of the values that were present but could not be parsed.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = _normalize(pd.Series(uniques, dtype=object))
+    if missing is not None:
+        normalized = normalized.where(~normalized.str.match(missing, na=False))
+    parsed = parse(normalized.dropna()).reindex(normalized.index).to_numpy(dtype='float64')
+    invalid = normalized.notna().to_numpy() & np.isnan(parsed)
+
+    # Code -1 marks a missing raw value: it stays missing and is not rejected
+    present = codes >= 0
+    result = np.full(len(codes), np.nan)
+    result[present] = parsed[codes[present]]
+    rejected = np.zeros(len(codes), dtype=bool)
+    rejected[present] = invalid[codes[present]]
+    return result, rejected
+
+
+def _parse_integers(values: pd.Series, parse: Callable[[pd.Series], pd.Series],
+                    missing: Optional[str] = None) -> Tuple[pd.Series, pd.Series]:
+    if pd.api.types.is_numeric_dtype(values):
+        return values.round().astype('Int64'), pd.Series(False, index=values.index)
+    result, rejected = _parse_distinct(values, parse, missing)
+    return (pd.Series(result, index=values.index, name=values.name).round().astype('Int64'),
+            pd.Series(rejected, index=values.index, name=values.name))
+
+
+def _is_blank(values: pd.Series) -> pd.Series:
+    # Missing or placeholder values, checked once per distinct value
+    codes, uniques = pd.factorize(values)
+    blank = _normalize(pd.Series(uniques, dtype=object)).isna().to_numpy()
+    return pd.Series((codes < 0) | blank[codes], index=values.index)
+
+
+def _votes_from_text(text: pd.Series) -> pd.Series:
+    parts = text.str.extract(VOTES_PATTERN)
+    number = pd.to_numeric(parts['number'], errors='coerce')
+    return number * parts['suffix'].map(VOTES_SCALE)
+
+
+def _minutes_from_text(text: pd.Series) -> pd.Series:
+    parts = text.str.extract(DURATION_PATTERN).apply(pd.to_numeric, errors='coerce')
+    minutes = parts['hours'].fillna(0) * 60 + parts['minutes'].fillna(0)
+    # The empty alternative of the "h/m" form matches nothing at all: invalid
+    hm_missing = parts['hours'].isna() & parts['minutes'].isna()
+    return minutes.where(~hm_missing, parts['plain'])
+
+
+def _rating_from_text(text: pd.Series) -> pd.Series:
+    rating = pd.to_numeric(text, errors='coerce')
+    return rating.where(rating.between(0, 10))
+
+
+def parse_votes(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Parse scraped vote counts such as '44K' or '1.2M' into integers.
+
+    Args:
+        values: The raw Votes column; numeric columns are passed through.
+
+    Returns:
+        tuple: The vote counts (Int64, missing as NA) and a boolean mask of
+        the values that could not be parsed.
+    """
+    return _parse_integers(values, _votes_from_text)
+
+
+def parse_duration(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Parse scraped runtimes such as '2h 7m' into minutes.
+
+    A missing runtime, including a certificate scraped in its place, stays
+    missing instead of becoming 0 minutes.
+
+    Args:
+        values: The raw Duration column; numeric columns are passed through.
+
+    Returns:
+        tuple: The runtimes in minutes (Int64, missing as NA) and a boolean
+        mask of the values that could not be parsed.
+    """
+    return _parse_integers(values, _minutes_from_text, missing=CERTIFICATE_PATTERN)
+
+
+def parse_rating(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Parse scraped ratings, which must lie between 0 and 10.
+
+    Args:
+        values: The raw Rating column.
+
+    Returns:
+        tuple: The ratings (float64, missing as NaN) and a boolean mask of
+        the values that are not numbers or out of range.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        rating = values.astype('float64')
+        invalid = rating.notna() & ~rating.between(0, 10)
+        return rating.where(~invalid), invalid
+    result, rejected = _parse_distinct(values, _rating_from_text)
+    return (pd.Series(result, index=values.index, name=values.name),
+            pd.Series(rejected, index=values.index, name=values.name))
+
+
+def clean_movies(df: pd.DataFrame) -> CleanResult:
+    """
+    Parse and validate scraped movie rows in one vectorized pass per field.
+
+    Missing values ('N/A', empty) become nulls. A row is rejected when a
+    value is present but malformed, or when it has no title or genre.
+
+    Args:
+        df: Scraped rows with the MOVIE_SCHEMA columns, as strings.
+
+    Returns:
+        CleanResult: The rows coerced to the compact movie_data schema, and
+        the rejected rows with the reason for each.
+    """
+    df = df[list(MOVIE_SCHEMA)]
+    rating, bad_rating = parse_rating(df['Rating'])
+    votes, bad_votes = parse_votes(df['Votes'])
+    duration, bad_duration = parse_duration(df['Duration'])
+
+    problems = pd.DataFrame({
+        'Rating': bad_rating, 'Votes': bad_votes, 'Duration': bad_duration,
+    })
+    for column in REQUIRED_COLUMNS:
+        problems[column] = _is_blank(df[column])
+    rejected = problems.any(axis=1)
+
+    reasons = problems[rejected]
+    reason = pd.Series([', '.join(reasons.columns[row]) for row in reasons.to_numpy()],
+                       index=reasons.index, dtype=object)
+    data = df.assign(Rating=rating, Votes=votes, Duration=duration)[~rejected]
+    return CleanResult(
+        data=coerce_movie_data(data),
+        rejected=df[rejected].assign(Reason=reason),
+    )
+
+
+def synthetic_scrape(rows: int, seed: int = 0, invalid_share: float = 0.001) -> pd.DataFrame:
+    """
+    Generate scraped-looking movie rows, formatted as IMDb prints them.
+
+    Args:
+        rows: Number of rows.
+        seed: Seed of the random generator.
+        invalid_share: Share of Votes and Duration values replaced by
+            'N/A' or by malformed text.
+
+    Returns:
+        pd.DataFrame: Rows with the MOVIE_SCHEMA columns, all as strings.
+    """
+    rng = np.random.default_rng(seed)
+    votes = np.exp(rng.uniform(np.log(5), np.log(3e6), rows)).astype(np.int64)
+    # IMDb style: exact below 1000, then thousands, then millions with one decimal
+    votes_text = np.where(
+        votes < 1000, votes.astype(str),
+        np.where(votes < 1_000_000,
+                 np.char.add((votes // 1000).astype(str), 'K'),
+                 np.char.add(np.round(votes / 1e6, 1).astype(str), 'M'))
+    ).astype(object)
+    hours = rng.integers(0, 4, rows)
+    minutes = rng.integers(0, 60, rows)
+    duration_text = np.where(
+        hours == 0, np.char.add(minutes.astype(str), 'm'),
+        np.where(minutes == 0, np.char.add(hours.astype(str), 'h'),
+                 np.char.add(np.char.add(hours.astype(str), 'h '),
+                             np.char.add(minutes.astype(str), 'm')))
+    ).astype(object)
+    for column in (votes_text, duration_text):
+        broken = rng.random(rows) < invalid_share
+        column[broken] = rng.choice(['N/A', '??', '1h 2x'], broken.sum())
+    genres = np.array(['Action', 'Comedy', 'Drama', 'Family', 'War', 'Western'])
+    return pd.DataFrame({
+        'Movie Name': np.char.add('Movie ', rng.integers(0, rows, rows).astype(str)).astype(object),
+        'Rating': np.round(rng.uniform(1, 10, rows), 1).astype(str).astype(object),
+        'Votes': votes_text,
+        'Duration': duration_text,
+        'Genre': genres[rng.integers(0, len(genres), rows)],
+    })
+
+
+def _notebook_clean(df: pd.DataFrame) -> pd.DataFrame:
+    # The notebook's steps, kept as the benchmark baseline
+    votes = df['Votes'].str.replace('K', 'e3').str.replace('M', 'e6')
+    hours = df['Duration'].str.extract(r'(\d+)h').fillna(0).astype(int)
+    minutes = df['Duration'].str.extract(r'(\d+)m').fillna(0).astype(int)
+    return df.assign(Votes=votes, Duration=(hours * 60 + minutes)[0])
+
+
+def benchmark(rows: int = 1_000_000) -> None:
+    """
+    Time the notebook's Votes/Duration cleaning against `clean_movies`.
+
+    Args:
+        rows: Number of synthetic rows.
+    """
+    df = synthetic_scrape(rows)
+    print(f"Synthetic input: {rows} rows")
+
+    started = time.perf_counter()
+    _notebook_clean(df)
+    baseline = time.perf_counter() - started
+    print(f"Notebook steps (Votes + Duration as text/int): {baseline:.2f}s")
+
+    started = time.perf_counter()
+    votes, _ = parse_votes(df['Votes'])
+    duration, _ = parse_duration(df['Duration'])
+    parsing = time.perf_counter() - started
+    print(f"parse_votes + parse_duration:                  {parsing:.2f}s "
+          f"({baseline / parsing:.1f}x)")
+
+    started = time.perf_counter()
+    result = clean_movies(df)
+    print(f"clean_movies (all fields, schema coercion):    "
+          f"{time.perf_counter() - started:.2f}s, {len(result.data)} kept, "
+          f"{len(result.rejected)} rejected, "
+          f"{int(result.data['Duration'].isna().sum())} runtimes missing")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Clean scraped movie CSV files.")
+    parser.add_argument('paths', nargs='*', help="scraped CSV files to check")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time the cleaning on synthetic data")
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help="number of synthetic rows for --benchmark")
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.rows)
+    for path in args.paths:
+        result = clean_movies(pd.read_csv(path, dtype=str, keep_default_na=False))
+        print(f"{path}: {len(result.data)} rows kept, {len(result.rejected)} rejected")
+        if len(result.rejected):
+            print(result.rejected.to_string())
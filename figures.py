@@ -0,0 +1,186 @@
+import os
+from io import BytesIO
+from typing import TYPE_CHECKING, Callable, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_layer import LRUCache
+
+# matplotlib and seaborn take a noticeable share of the app's startup time,
+# so they are imported inside the functions that draw: a rerun served
+# entirely from the figure cache never imports them
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+# Number of rendered figures kept per process
+FIGURE_CACHE_SIZE = int(os.environ.get("IMDB_FIGURE_CACHE_SIZE", "32"))
+# Resolution of the rendered raster images
+FIGURE_DPI = int(os.environ.get("IMDB_FIGURE_DPI", "150"))
+# Above this many rows scatter plots are drawn as binned density maps
+SCATTER_ROW_THRESHOLD = int(os.environ.get("IMDB_SCATTER_THRESHOLD", "50000"))
+# Number of bins along each axis of a density map
+DENSITY_GRID_SIZE = int(os.environ.get("IMDB_DENSITY_GRID_SIZE", "80"))
+
+
+def render_figure(draw: Callable[['Axes'], None], fmt: str = 'png',
+                  dpi: int = FIGURE_DPI) -> bytes:
+    """
+    Draw a chart on a fresh figure and return it as encoded image bytes.
+
+    The object-oriented Figure API is used instead of pyplot so that
+    concurrent sessions never share global plotting state.
+
+    Args:
+        draw: A callable drawing the chart on the given Axes.
+        fmt: The image format ('png' or 'svg').
+        dpi: Resolution for raster formats.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    draw(ax)
+    buffer = BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """
+    Rendered charts keyed on (chart id, data version, parameters).
+
+    A chart is drawn once per data version and filter combination; every
+    later rerun, in any session, only sends the stored bytes.
+    """
+
+    def __init__(self, maxsize: int = FIGURE_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+
+    def render(self, chart_id: str, version: Hashable,
+               draw: Callable[['Axes'], None], params: Hashable = (),
+               fmt: str = 'png') -> bytes:
+        """
+        Return the rendered chart, drawing it only on a cache miss.
+
+        Args:
+            chart_id: A unique name for the chart.
+            version: The data version the chart is drawn from.
+            draw: A callable drawing the chart on the given Axes.
+            params: Any filter values that change the chart.
+            fmt: The image format ('png' or 'svg').
+
+        Returns:
+            bytes: The encoded image.
+        """
+        key = (chart_id, version, params, fmt)
+        return self.cache.get_or_compute(key, lambda: render_figure(draw, fmt))
+
+
+_figure_cache = FigureCache()
+
+
+def get_figure_cache() -> FigureCache:
+    """
+    Returns:
+        FigureCache: The process-wide figure cache.
+    """
+    return _figure_cache
+
+
+def draw_genre_counts(ax: 'Axes', counts: pd.Series) -> None:
+    """Bar chart of the number of movies per genre."""
+    ax.bar(counts.index, counts.values)
+    ax.set_xlabel('Genre')
+    ax.set_ylabel('No. of Movies')
+    ax.set_title('Distribution of Movies Across Genres')
+    ax.set_xticks(range(len(counts)), counts.index, rotation=45)
+    ax.legend(['Movies'])
+    ax.bar_label(ax.containers[0], fontsize=8, padding=3)
+
+
+def draw_genre_means(ax: 'Axes', means: pd.Series, ylabel: str,
+                     title: str) -> None:
+    """Bar chart of a precomputed per-genre average, one colour per genre."""
+    import seaborn as sns
+
+    ax.bar(means.index, means.values,
+           color=sns.color_palette(n_colors=len(means)))
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel('Genre')
+    ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.autoscale()
+
+
+def bin_2d(x: np.ndarray, y: np.ndarray, bins: int = DENSITY_GRID_SIZE,
+           log_x: bool = False,
+           log_y: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count points per cell of a regular (or log-spaced) 2D grid.
+
+    Missing values are dropped; on a log axis values below 1 are clipped to 1.
+
+    Args:
+        x: The x coordinates.
+        y: The y coordinates.
+        bins: Number of bins along each axis.
+        log_x: Space the x bins logarithmically.
+        log_y: Space the y bins logarithmically.
+
+    Returns:
+        tuple: The (bins, bins) count matrix indexed [x, y], and the x and y
+        bin edges.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if log_x:
+        x = np.maximum(x, 1.0)
+    if log_y:
+        y = np.maximum(y, 1.0)
+    edges = []
+    for values, log in ((x, log_x), (y, log_y)):
+        low, high = (values.min(), values.max()) if len(values) else (1.0, 2.0)
+        if high <= low:
+            high = low + 1.0
+        edges.append(np.geomspace(low, high, bins + 1) if log
+                     else np.linspace(low, high, bins + 1))
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=edges)
+    return counts, x_edges, y_edges
+
+
+def draw_scatter(ax: 'Axes', df: pd.DataFrame, x: str, y: str, xlabel: str,
+                 ylabel: str, title: str, log_y: bool = False,
+                 threshold: int = SCATTER_ROW_THRESHOLD) -> None:
+    """
+    Scatter plot of two numeric columns, binned into a density map at scale.
+
+    Up to `threshold` rows every point is drawn. Beyond that the points are
+    counted on a fixed grid, so drawing cost depends on the grid size and
+    not on the number of rows; `log_y` spaces the grid (and the axis)
+    logarithmically, which suits heavy-tailed columns such as Votes.
+    """
+    if len(df) <= threshold:
+        import seaborn as sns
+
+        sns.scatterplot(data=df, x=x, y=y, alpha=0.5, ax=ax)
+    else:
+        from matplotlib.colors import LogNorm
+
+        counts, x_edges, y_edges = bin_2d(
+            df[x].to_numpy(dtype='float64', na_value=np.nan),
+            df[y].to_numpy(dtype='float64', na_value=np.nan),
+            log_y=log_y
+        )
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0),
+                             norm=LogNorm(), cmap='viridis')
+        if log_y:
+            ax.set_yscale('log')
+        ax.figure.colorbar(mesh, ax=ax, label='No. of Movies')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.autoscale()
@@ -0,0 +1,191 @@
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# A movie is identified by its title and runtime: the scraped rows carry no
+# release year, and votes and ratings drift between genre pages scraped
+# minutes apart, while two different films sharing a title rarely share a runtime
+MOVIE_KEY = ('Movie Name', 'Duration')
+# Movie columns kept on the unique movies; Genre moves to the bitmask
+MOVIE_COLUMNS = ('Movie Name', 'Rating', 'Votes', 'Duration')
+# Genres that fit in the uint64 bitmask
+MAX_GENRES = 64
+
+MATCH_MODES = ('any', 'all')
+
+
+def split_genres(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split comma-separated Genre values ("Action, Drama") into one row each.
+
+    The split is done once per distinct Genre value, so it stays cheap on
+    large frames where only a handful of distinct values exist.
+
+    Args:
+        df: Movie rows with a 'Genre' column.
+
+    Returns:
+        pd.DataFrame: One row per movie row and genre, without blank genres.
+    """
+    codes, uniques = pd.factorize(df['Genre'])
+    parts = [[g.strip() for g in str(value).split(',') if g.strip()] for value in uniques]
+    # Code -1 (missing genre) picks the trailing empty entry
+    parts.append([])
+    lengths = np.array([len(p) for p in parts])
+    if (lengths[:-1] == 1).all() and not (codes < 0).any():
+        return df.assign(Genre=pd.Categorical([p[0] for p in parts[:-1]])[codes])
+
+    flat = np.array([g for p in parts for g in p], dtype=object)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    counts = lengths[codes]
+    rows = np.repeat(np.arange(len(df)), counts)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    genres = flat[starts[codes][rows] + offsets]
+    return df.iloc[rows].assign(Genre=pd.Categorical(genres))
+
+
+class GenreIndex:
+    """
+    Unique movies with a bitmask of their genres.
+
+    The scraped table repeats a movie once per genre page it appears on.
+    Here every movie is stored once, and bit `i` of its mask is set when it
+    belongs to `genres[i]`, so any-of / all-of genre filters are a single
+    bitwise AND over one integer array.
+    """
+
+    def __init__(self, movies: pd.DataFrame, masks: np.ndarray, genres: pd.Index):
+        self.movies = movies
+        self.masks = masks
+        self.genres = genres
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "GenreIndex":
+        """
+        Normalize movie rows (one per movie and genre) into unique movies.
+
+        Args:
+            df: Movie data with the MOVIE_COLUMNS and 'Genre' columns.
+
+        Returns:
+            GenreIndex: The unique movies and their genre masks.
+
+        Raises:
+            ValueError: If there are more genres than bits in the mask.
+        """
+        links = split_genres(df[list(MOVIE_COLUMNS) + ['Genre']])
+        genre_codes, genres = pd.factorize(links['Genre'], sort=True)
+        if len(genres) > MAX_GENRES:
+            raise ValueError(f"{len(genres)} genres do not fit in a {MAX_GENRES}-bit mask")
+
+        ids = links.groupby(list(MOVIE_KEY), dropna=False, sort=False).ngroup().to_numpy()
+        # Keep the highest vote count and rating seen across the genre pages
+        movies = links.groupby(ids, sort=True).agg({
+            'Movie Name': 'first', 'Rating': 'max', 'Votes': 'max', 'Duration': 'first',
+        }).reset_index(drop=True)
+        masks = np.zeros(len(movies), dtype=np.uint64)
+        np.bitwise_or.at(masks, ids, np.left_shift(np.uint64(1), genre_codes.astype(np.uint64)))
+
+        index = cls(movies, masks, pd.Index(genres, name='Genre'))
+        movies['Genre'] = index.labels()
+        return index
+
+    def labels(self) -> pd.Categorical:
+        """
+        Returns:
+            pd.Categorical: The genres of every movie, as "Action, Drama".
+        """
+        # Few genre combinations exist, so each distinct mask is decoded once
+        codes, uniques = pd.factorize(self.masks)
+        names = [', '.join(g for i, g in enumerate(self.genres) if int(mask) >> i & 1)
+                 for mask in uniques]
+        return pd.Categorical.from_codes(codes, categories=names)
+
+    def mask_of(self, genres: Iterable[str]) -> int:
+        """
+        Args:
+            genres: Genre names; unknown names are ignored.
+
+        Returns:
+            int: The bitmask with the bits of `genres` set.
+        """
+        positions = self.genres.get_indexer(list(genres))
+        return sum(1 << int(i) for i in set(positions) if i >= 0)
+
+    def select(self, genres: Iterable[str], match: str = 'any') -> np.ndarray:
+        """
+        Select the movies having any (or all) of `genres`.
+
+        Args:
+            genres: The genres to filter on. No genre selects no movie.
+            match: 'any' for movies with at least one of the genres, 'all'
+                for movies with every one of them.
+
+        Returns:
+            np.ndarray: A boolean mask aligned with `movies`.
+        """
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match!r}")
+        genres = set(genres)
+        mask = self.mask_of(genres)
+        if not genres or (match == 'all' and bin(mask).count('1') < len(genres)):
+            return np.zeros(len(self.masks), dtype=bool)
+        hits = self.masks & np.uint64(mask)
+        if match == 'any':
+            return hits != 0
+        return hits == np.uint64(mask)
+
+    def matches(self, genres: Iterable[str], match: str, rating: Tuple[float, float],
+                duration: Tuple[int, int], votes: Tuple[int, int]) -> np.ndarray:
+        """
+        Evaluate the Advanced Title Search form on the unique movies.
+
+        Args:
+            genres: The selected genres.
+            match: 'any' or 'all', see `select`.
+            rating: Inclusive rating range.
+            duration: Inclusive duration range, in minutes.
+            votes: Inclusive vote count range.
+
+        Returns:
+            np.ndarray: A boolean mask aligned with `movies`.
+        """
+        movies = self.movies
+        return (
+            self.select(genres, match) &
+            movies['Rating'].between(*rating).to_numpy() &
+            movies['Duration'].between(*duration).fillna(False).to_numpy(dtype=bool) &
+            movies['Votes'].between(*votes).fillna(False).to_numpy(dtype=bool)
+        )
+
+    def filter(self, genres: Iterable[str], match: str, rating: Tuple[float, float],
+               duration: Tuple[int, int], votes: Tuple[int, int]) -> pd.DataFrame:
+        """
+        Apply the Advanced Title Search form to the unique movies.
+
+        Args:
+            See `matches`.
+
+        Returns:
+            pd.DataFrame: The matching movies.
+        """
+        return self.movies[self.matches(genres, match, rating, duration, votes)]
+
+    def exploded(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: One row per movie and genre, each movie counted
+            once per genre, with 'Genre' as a single genre name.
+        """
+        positions = []
+        codes = []
+        for i in range(len(self.genres)):
+            members = np.flatnonzero(self.masks >> np.uint64(i) & np.uint64(1))
+            positions.append(members)
+            codes.append(np.full(len(members), i))
+        positions = np.concatenate(positions) if positions else np.array([], dtype=int)
+        codes = np.concatenate(codes) if codes else np.array([], dtype=int)
+        return self.movies.iloc[positions].assign(
+            Genre=pd.Categorical.from_codes(codes, categories=self.genres)
+        )
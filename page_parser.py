@@ -0,0 +1,191 @@
+import argparse
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+from lxml import etree
+
+from checkpoint import OUTPUT_DIR, apply_delta, checkpoint_name, genre_dataset
+
+# Folder holding the saved, fully expanded genre pages
+PAGES_DIR = os.path.join(OUTPUT_DIR, ".pages")
+# Number of processes parsing saved pages in parallel
+PARSER_WORKERS = int(os.environ.get("IMDB_PARSER_WORKERS", str(os.cpu_count() or 1)))
+
+# Locations of the elements read on an IMDb search result page
+MOVIE_LIST_XPATH = '//*[@id="__next"]/main/div[2]/div[3]/section/section/div/section/section/div[2]/div/section/div[2]/div[2]/ul/li'
+GENRE_XPATH = '//*[@id="__next"]/main/div[2]/div[3]/section/section/div/section/section/div[2]/div/section/div[1]/div/div/div[2]/button[3]/span'
+DURATION_XPATH = './div/div/div/div[1]/div[2]/div[2]/span[2]'
+YEAR_XPATH = './div/div/div/div[1]/div[2]/div[2]/span[1]'
+
+# Both page-level XPaths start from the element with this id. lxml would
+# scan every element of the page for it, so it is looked up once by hand
+# and the rest of the paths are evaluated from there.
+ROOT_ID = "__next"
+_ROOT_XPATH = f'//*[@id="{ROOT_ID}"]'
+
+# The same queries as the browser-side extraction, compiled once per process
+_ITEMS = etree.XPath("." + MOVIE_LIST_XPATH[len(_ROOT_XPATH):])
+_GENRE = etree.XPath("." + GENRE_XPATH[len(_ROOT_XPATH):])
+# The text of an element, without its comments, like innerText
+_STRING = etree.XPath("string()")
+# The year and the duration are the first two spans of the same block
+_DETAILS = etree.XPath(DURATION_XPATH.rsplit("/", 1)[0])
+# Elements of a movie item found by tag and exact class, like the
+# querySelector calls of the browser-side extraction
+TITLE_ELEMENT = ("h3", "ipc-title__text")
+RATING_ELEMENT = ("span", "ipc-rating-star--rating")
+VOTES_ELEMENT = ("span", "ipc-rating-star--voteCount")
+
+# First line of a saved page, recording where it came from
+SAVED_FROM = "<!-- saved from url={} -->\n"
+_SAVED_FROM = re.compile(r"<!-- saved from url=(\S+) -->")
+
+
+def page_path(url, pages_dir=PAGES_DIR):
+    # Name a saved page after the genre in the URL, like its checkpoint
+    return os.path.join(pages_dir, f"{checkpoint_name(url)}.html")
+
+
+def save_page(url, page_source, pages_dir=PAGES_DIR):
+    # Write to a temporary file and move it into place, so a crash never leaves half a page
+    os.makedirs(pages_dir, exist_ok=True)
+    path = page_path(url, pages_dir)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(SAVED_FROM.format(url))
+        f.write(page_source)
+    os.replace(f"{path}.tmp", path)
+    print(f"Saved page '{url}' to '{path}'")
+    return path
+
+
+def group_by_genre(movies):
+    # Initialize a dictionary to store movie data categorized by genre
+    genre_data = {}
+    for movie in movies:
+        # Split the genre(s) into a list and store movie data in a dictionary under each genre
+        for g in movie["Genre"].split(", "):
+            # Append movie details to the respective genre's list
+            genre_data.setdefault(g, []).append(movie)
+    return genre_data
+
+
+def _text(node):
+    # Trimmed text of an element, or None
+    return _STRING(node).strip() if node is not None else None
+
+
+def _span(details, position):
+    # The span at `position` (from 1) among the spans of the details block, like span[position]
+    spans = [child for child in details[0] if child.tag == "span"] if details else []
+    return spans[position - 1] if len(spans) >= position else None
+
+
+def _root(tree):
+    # The element is near the top of the page, so stop at the first match
+    return next((el for el in tree.iter(etree.Element) if el.get("id") == ROOT_ID), None)
+
+
+def _genre_of_url(url):
+    # "talk-show" in the URL is the "Talk-Show" genre
+    genres = parse_qs(urlparse(url).query).get("genres") if url else None
+    return genres[0].title() if genres else None
+
+
+def parse_page(page_source, url=None):
+    """
+    Extract the movie records from the HTML of an expanded genre page.
+
+    The records are the ones the browser-side extraction returns, with the
+    same fallbacks, so saved pages can be parsed again without a browser.
+    The genre is read once from the page's genre filter; when the filter
+    is not found, it is taken from the page URL before falling back to
+    "Unknown".
+
+    Args:
+        page_source: The page HTML, e.g. as saved by `save_page`.
+        url: The page URL, if known.
+
+    Returns:
+        list: One dict per movie with the name, rating, votes, duration,
+        genre and year.
+    """
+    # Plain lxml elements: lxml.html looks up a Python class for every element
+    root = _root(etree.fromstring(page_source, etree.HTMLParser()))
+    if root is None:
+        return []
+    genre_nodes = _GENRE(root)
+    genre = (_text(genre_nodes[0]) if genre_nodes else None) or _genre_of_url(url) or "Unknown"
+    movies = []
+    for item in _ITEMS(root):
+        # One walk over the item finds the first element of every tag and class
+        elements = {}
+        for element in item.iter("h3", "span"):
+            elements.setdefault((element.tag, element.get("class")), element)
+        title = _text(elements.get(TITLE_ELEMENT))
+        if not title or ". " not in title:
+            continue
+        votes = _text(elements.get(VOTES_ELEMENT))
+        details = _DETAILS(item)
+        movies.append({
+            "Movie Name": title.split(". ", 1)[1],
+            "Rating": _text(elements.get(RATING_ELEMENT)) or "N/A",
+            "Votes": votes.replace("(", "").replace(")", "").strip() if votes else "N/A",
+            "Duration": _text(_span(details, 2)) or "N/A",
+            "Genre": genre,
+            "Year": _text(_span(details, 1)),
+        })
+    return movies
+
+
+def parse_page_file(path):
+    # Parse one saved page, using the URL recorded on its first line
+    with open(path, encoding="utf-8") as f:
+        page_source = f.read()
+    saved_from = _SAVED_FROM.match(page_source)
+    return parse_page(page_source, saved_from.group(1) if saved_from else None)
+
+
+def parse_pages(paths, workers=PARSER_WORKERS):
+    """
+    Parse saved genre pages on a pool of processes, one page per task.
+
+    Args:
+        paths: The saved page files.
+        workers: Maximum number of processes; 1 parses in this process.
+
+    Returns:
+        dict: The records of all pages, grouped by genre like the result of
+        `scraper.webscrapper`.
+    """
+    paths = list(paths)
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        pages = map(parse_page_file, paths)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pages = list(pool.map(parse_page_file, paths))
+    return group_by_genre(movie for page in pages for movie in page)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Extract the movie data from saved genre pages, without a browser."
+    )
+    parser.add_argument('pages', nargs='*',
+                        help=f"saved page files (default: {PAGES_DIR}/*.html)")
+    parser.add_argument('--workers', type=int, default=PARSER_WORKERS)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help="folder of the genre CSV files")
+    parser.add_argument('--incremental', action='store_true',
+                        help="merge into the stored genre data and write only new or "
+                             "changed movies to <output-dir>/delta, like an incremental scrape")
+    args = parser.parse_args()
+    genre_data = parse_pages(args.pages or sorted(glob.glob(os.path.join(PAGES_DIR, '*.html'))),
+                             args.workers)
+    if args.incremental:
+        apply_delta(genre_data, args.output_dir, os.path.join(args.output_dir, ".checkpoints"))
+    else:
+        genre_dataset(genre_data, args.output_dir)
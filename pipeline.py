@@ -0,0 +1,404 @@
+import argparse
+import glob
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (Column, DateTime, Integer, MetaData, String, Table,
+                        and_, create_engine, delete, func, inspect, insert,
+                        select, text, tuple_)
+from sqlalchemy.engine import Connection, Engine
+
+from aggregates import GenreAggregates
+from checkpoint import DELTA_DIR
+from cleaning import CleanResult, clean_movies
+from data_layer import DB_URL, META_TABLE
+from genres import MOVIE_KEY, split_genres
+from schema import (MOVIE_GENRES_TABLE, MOVIE_SCHEMA, MOVIES_TABLE, TABLE_NAME,
+                    movie_genres_table_named, movie_table_named,
+                    movies_table_named)
+from search import ensure_search_indexes
+
+# Rows per chunk flowing through cleaning and into each multi-row insert
+CHUNK_SIZE = int(os.environ.get("IMDB_PIPELINE_CHUNK_SIZE", "5000"))
+
+# Suffixes of the tables used while swapping in a new load
+STAGING_SUFFIX = "__staging"
+OLD_SUFFIX = "__old"
+
+_meta_metadata = MetaData()
+meta_table = Table(
+    META_TABLE, _meta_metadata,
+    Column('batch_id', Integer, primary_key=True, autoincrement=False),
+    Column('loaded_at', DateTime),
+    Column('rows', Integer),
+    Column('mode', String(16)),
+)
+
+
+def iter_csv_chunks(paths: Iterable[str],
+                    chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream the scraped genre CSV files as DataFrame chunks.
+
+    Args:
+        paths: The CSV files to read, e.g. one per genre.
+        chunksize: Rows per chunk.
+
+    Yields:
+        pd.DataFrame: Raw scraped rows.
+    """
+    for path in paths:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def iter_record_chunks(genre_data: Dict[str, List[dict]],
+                       chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream scraped records (as returned by the scraper) as DataFrame chunks.
+
+    Args:
+        genre_data: Scraped records grouped by genre.
+        chunksize: Rows per chunk.
+
+    Yields:
+        pd.DataFrame: Raw scraped rows.
+    """
+    for records in genre_data.values():
+        for start in range(0, len(records), chunksize):
+            yield pd.DataFrame(records[start:start + chunksize],
+                               columns=list(MOVIE_SCHEMA))
+
+
+def clean_chunk(chunk: pd.DataFrame) -> CleanResult:
+    """
+    Apply the notebook's cleaning steps to one chunk of scraped rows.
+
+    Rows with a field scraped as 'N/A' are dropped, as in the notebook. The
+    rest is parsed by `clean_movies`: Votes such as '44K' become numbers,
+    Duration such as '2h 7m' becomes minutes (a runtime that turns out to
+    be missing stays null), and malformed rows are rejected. A Genre list
+    such as 'Action, Drama' is split into one row per genre.
+
+    Args:
+        chunk: Raw scraped rows.
+
+    Returns:
+        CleanResult: The cleaned rows and the rejected ones.
+    """
+    result = clean_movies(chunk[list(MOVIE_SCHEMA)].replace("N/A", np.nan).dropna())
+    return CleanResult(data=split_genres(result.data), rejected=result.rejected)
+
+
+def clean_chunks(chunks: Iterable[pd.DataFrame],
+                 rejected: Optional[List[pd.DataFrame]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Clean a stream of chunks, dropping rows already seen in earlier chunks.
+
+    Only a hash per distinct row is kept across chunks, so memory stays
+    bounded by the number of distinct rows rather than the data itself.
+
+    Args:
+        chunks: Raw scraped rows.
+        rejected: If given, the rejected rows of every chunk are appended to it.
+
+    Yields:
+        pd.DataFrame: Cleaned, de-duplicated rows.
+    """
+    seen = set()
+    for chunk in chunks:
+        result = clean_chunk(chunk)
+        if rejected is not None and len(result.rejected):
+            rejected.append(result.rejected)
+        cleaned = result.data
+        hashes = pd.util.hash_pandas_object(cleaned, index=False).to_numpy()
+        keep = np.zeros(len(hashes), dtype=bool)
+        for i, row_hash in enumerate(hashes):
+            if row_hash not in seen:
+                seen.add(row_hash)
+                keep[i] = True
+        if keep.any():
+            yield cleaned[keep]
+
+
+def _to_rows(chunk: pd.DataFrame) -> List[dict]:
+    # Plain Python values for executemany; float32 is widened without
+    # exposing its binary representation (7.4 must not become 7.400000095)
+    chunk = chunk.astype({column: 'float64' for column in chunk.columns
+                          if chunk[column].dtype == 'float32'}).round(6)
+    return chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+
+
+def _next_batch(conn: Connection) -> int:
+    last = conn.execute(select(func.max(meta_table.c.batch_id))).scalar()
+    return (last or 0) + 1
+
+
+def _record_batch(conn: Connection, batch_id: int, rows: int, mode: str) -> None:
+    conn.execute(insert(meta_table).values(
+        batch_id=batch_id, loaded_at=datetime.now(), rows=rows, mode=mode
+    ))
+
+
+def _swap_tables(conn: Connection, swaps: Dict[str, str]) -> None:
+    """
+    Replace every table by its staging table so that readers see either the
+    old tables or the new ones, never a mix.
+
+    Args:
+        conn: The connection of the load.
+        swaps: The staging table name of every table to replace.
+    """
+    existing = [table for table in swaps.values() if inspect(conn).has_table(table)]
+    if conn.dialect.name == 'mysql':
+        # RENAME TABLE commits implicitly, but one statement renaming every
+        # table is a single atomic operation in MySQL
+        for table in existing:
+            conn.execute(text(f"DROP TABLE IF EXISTS `{table}{OLD_SUFFIX}`"))
+        renames = [f"`{table}` TO `{table}{OLD_SUFFIX}`" for table in existing]
+        renames += [f"`{staging}` TO `{table}`" for staging, table in swaps.items()]
+        conn.execute(text(f"RENAME TABLE {', '.join(renames)}"))
+        for table in existing:
+            conn.execute(text(f"DROP TABLE `{table}{OLD_SUFFIX}`"))
+    else:
+        # Transactional DDL (SQLite, PostgreSQL): the swap commits with the load
+        for table in existing:
+            conn.execute(text(f'DROP TABLE "{table}"'))
+        for staging, table in swaps.items():
+            conn.execute(text(f'ALTER TABLE "{staging}" RENAME TO "{table}"'))
+
+
+def _genre_model_staging() -> tuple:
+    # The staging tables of the normalized movies and movie_genres tables
+    return (movies_table_named(f"{MOVIES_TABLE}{STAGING_SUFFIX}"),
+            movie_genres_table_named(f"{MOVIE_GENRES_TABLE}{STAGING_SUFFIX}"))
+
+
+def _stage_genre_model(conn: Connection, source: str) -> Dict[str, str]:
+    """
+    Build the normalized movies and movie_genres tables from `source` as
+    staging tables, to be swapped in with `_swap_tables`.
+
+    Rows of `source` sharing a MOVIE_KEY become one movie, keeping the
+    highest vote count and rating seen; each of its genres becomes one
+    mapping row.
+
+    Returns:
+        dict: The staging table name of each normalized table.
+    """
+    rows = movie_table_named(source)
+    movies, links = _genre_model_staging()
+    for staging in (movies, links):
+        staging.drop(conn, checkfirst=True)
+        staging.create(conn)
+
+    key = [rows.c[name] for name in MOVIE_KEY]
+    conn.execute(insert(movies).from_select(
+        ['Movie Name', 'Duration', 'Rating', 'Votes'],
+        select(*key, func.max(rows.c['Rating']), func.max(rows.c['Votes'])).group_by(*key)
+    ))
+    # Null-safe join, as a missing runtime is part of the key
+    same_movie = and_(*[movies.c[name].is_not_distinct_from(rows.c[name])
+                        for name in MOVIE_KEY])
+    conn.execute(insert(links).from_select(
+        ['Genre', 'movie_id'],
+        select(rows.c['Genre'], movies.c['movie_id'])
+        .join_from(rows, movies, same_movie).distinct()
+    ))
+    return {movies.name: MOVIES_TABLE, links.name: MOVIE_GENRES_TABLE}
+
+
+def bulk_load(engine: Engine, chunks: Iterable[pd.DataFrame],
+              table: str = TABLE_NAME) -> int:
+    """
+    Load a stream of cleaned chunks as the new contents of `table`.
+
+    Chunks are written with multi-row inserts into a staging table, the
+    normalized movies and movie_genres tables are built next to it, the
+    three tables are swapped in place of the live ones at once, so the
+    dashboard never sees a half-loaded table or a mix of loads, and the
+    load batch is recorded (the data layer uses it as the table version).
+
+    On SQLite and PostgreSQL all of this is one transaction. On MySQL, DDL
+    commits implicitly, so the staging tables are filled outside of a
+    transaction, the swap is a single multi-table RENAME TABLE, and the
+    batch is recorded only once the new tables are in place.
+    The per-genre summary read by the dashboard is then computed from the
+    normalized tables and stored for that batch.
+
+    Args:
+        engine: The engine connected to the movie database.
+        chunks: Cleaned rows, e.g. from `clean_chunks`.
+        table: The table to replace.
+
+    Returns:
+        int: Number of rows loaded.
+
+    Raises:
+        ValueError: If the stream is empty; the live table is left as is.
+    """
+    staging = movie_table_named(f"{table}{STAGING_SUFFIX}")
+    rows = 0
+    # Created up front: DDL would end the load's transaction on MySQL
+    meta_table.create(engine, checkfirst=True)
+    try:
+        with engine.begin() as conn:
+            staging.drop(conn, checkfirst=True)
+            staging.create(conn)
+            for chunk in chunks:
+                conn.execute(insert(staging), _to_rows(chunk))
+                rows += len(chunk)
+            if not rows:
+                # Leaving the transaction rolls the staging table back
+                raise ValueError("No rows to load; the current table is kept")
+            batch_id = _next_batch(conn)
+            swaps = _stage_genre_model(conn, staging.name)
+            swaps[staging.name] = table
+            _swap_tables(conn, swaps)
+            # After the swap: the new version must not be visible before the new tables
+            _record_batch(conn, batch_id, rows, 'replace')
+    except Exception:
+        # Do not leave half-filled staging tables behind
+        for leftover in (staging,) + _genre_model_staging():
+            leftover.drop(engine, checkfirst=True)
+        raise
+    with engine.connect() as conn:
+        GenreAggregates.from_database(conn).persist(engine, batch_id=batch_id)
+    ensure_search_indexes(engine)
+    return rows
+
+
+def upsert(engine: Engine, chunks: Iterable[pd.DataFrame],
+           table: str = TABLE_NAME) -> int:
+    """
+    Insert or replace rows of `table`, keyed on (Movie Name, Genre).
+
+    Meant for the new or changed movies of an incremental scrape: every
+    chunk deletes the rows it replaces and inserts its own, all in one
+    transaction. The normalized movies and movie_genres tables are then
+    rebuilt from the updated table, and the stored per-genre summary is
+    recomputed for the genres of the changed movies only.
+
+    Args:
+        engine: The engine connected to the movie database.
+        chunks: Cleaned rows, e.g. from `clean_chunks`.
+        table: The table to update.
+
+    Returns:
+        int: Number of rows inserted or replaced.
+    """
+    target = movie_table_named(table)
+    key = tuple_(target.c['Movie Name'], target.c['Genre'])
+    # Every genre of a changed movie: its votes and rating count in all of them
+    touched = set()
+    rows = 0
+    # Created up front: DDL would end the upsert's transaction on MySQL
+    target.create(engine, checkfirst=True)
+    meta_table.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for chunk in chunks:
+            keys = list(zip(chunk['Movie Name'].astype(str), chunk['Genre'].astype(str)))
+            touched.update(conn.execute(
+                select(target.c['Genre']).distinct()
+                .where(target.c['Movie Name'].in_({name for name, _ in keys}))
+            ).scalars())
+            conn.execute(delete(target).where(key.in_(keys)))
+            conn.execute(insert(target), _to_rows(chunk))
+            touched.update(genre for _, genre in keys)
+            rows += len(chunk)
+    with engine.begin() as conn:
+        _swap_tables(conn, _stage_genre_model(conn, table))
+        batch_id = _next_batch(conn)
+        _record_batch(conn, batch_id, rows, 'upsert')
+
+    # Min and max cannot be updated by subtracting the old values, so the
+    # genres of the changed movies are summarised again, and only them
+    with engine.connect() as conn:
+        summary = GenreAggregates.read(engine)
+        if summary is None:
+            summary = GenreAggregates.from_database(conn)
+        elif touched:
+            summary = summary.replace(touched, GenreAggregates.from_database(conn, touched))
+    summary.persist(engine, batch_id=batch_id)
+    # The rebuilt movies table comes without the search indexes
+    ensure_search_indexes(engine)
+    return rows
+
+
+def run_pipeline(chunks: Iterable[pd.DataFrame], engine: Engine,
+                 incremental: bool = False,
+                 rejected: Optional[List[pd.DataFrame]] = None) -> int:
+    """
+    Stream raw scraped chunks through cleaning into the database.
+
+    Args:
+        chunks: Raw scraped rows, from `iter_csv_chunks` or `iter_record_chunks`.
+        engine: The engine connected to the movie database.
+        incremental: Upsert the rows instead of replacing the whole table.
+        rejected: If given, the rows rejected by cleaning are appended to it.
+
+    Returns:
+        int: Number of rows written.
+    """
+    cleaned = clean_chunks(chunks, rejected)
+    if incremental:
+        return upsert(engine, cleaned)
+    return bulk_load(engine, cleaned)
+
+
+def load_delta(engine: Engine, delta_dir: str = DELTA_DIR,
+               rejected: Optional[List[pd.DataFrame]] = None) -> int:
+    """
+    Upsert the new or changed movies saved by incremental scrapes.
+
+    The delta files (see checkpoint.apply_delta) accumulate until loaded;
+    they are removed once the upsert succeeded, so the next scrapes start
+    new ones. Do not scrape into `delta_dir` while this runs.
+
+    Args:
+        engine: The engine connected to the movie database.
+        delta_dir: Folder of the delta CSV files.
+        rejected: If given, the rows rejected by cleaning are appended to it.
+
+    Returns:
+        int: Number of rows written.
+    """
+    paths = sorted(glob.glob(os.path.join(delta_dir, "*.csv")))
+    if not paths:
+        return 0
+    rows = run_pipeline(iter_csv_chunks(paths), engine, incremental=True, rejected=rejected)
+    for path in paths:
+        os.remove(path)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Load scraped genre CSV files into the movie database."
+    )
+    parser.add_argument('paths', nargs='*',
+                        help="CSV files to load (default: every genre CSV file, or with "
+                             "--incremental the new or changed movies in delta/)")
+    parser.add_argument('--db', default=DB_URL, help="SQLAlchemy database URL")
+    parser.add_argument('--incremental', action='store_true',
+                        help="upsert the rows instead of replacing the table")
+    parser.add_argument('--rejects', help="CSV file to write the rejected rows to")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    rejected = []
+    if args.incremental and not args.paths:
+        # The pending new or changed movies of incremental scrapes, removed once loaded
+        loaded = load_delta(create_engine(args.db), rejected=rejected)
+    else:
+        paths = args.paths or glob.glob(os.path.join("IMDB_2024_Genres_Data", "*.csv"))
+        loaded = run_pipeline(iter_csv_chunks(paths), create_engine(args.db),
+                              incremental=args.incremental, rejected=rejected)
+    print(f"Loaded {loaded} rows in {time.perf_counter() - started:.1f}s")
+    if rejected:
+        rejected = pd.concat(rejected)
+        print(f"Rejected {len(rejected)} rows")
+        if args.rejects:
+            rejected.to_csv(args.rejects, index=False)
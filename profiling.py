@@ -0,0 +1,195 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator, List, Optional
+
+# Turn the profiling panel on for every session (it can also be turned on
+# per session with the ?profile=1 query parameter)
+PROFILE_ENABLED = os.environ.get("IMDB_PROFILE", "").lower() in ("1", "true", "yes")
+# Runs kept per session for the JSON export
+PROFILE_HISTORY = int(os.environ.get("IMDB_PROFILE_HISTORY", "20"))
+# Functions listed in the cProfile report, by cumulative time
+CPROFILE_LINES = int(os.environ.get("IMDB_CPROFILE_LINES", "30"))
+
+# The profile of the script run executing in this thread (Streamlit runs
+# each session's script in a thread of its own)
+_current = threading.local()
+
+# tracemalloc is process-wide: it runs while any profiled run needs it, and
+# is stopped by the last one, unless something else had started it
+_tracing_lock = threading.Lock()
+_tracing_runs = 0
+_tracing_started_here = False
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracing_runs, _tracing_started_here
+    with _tracing_lock:
+        if _tracing_runs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started_here = True
+        _tracing_runs += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracing_runs, _tracing_started_here
+    with _tracing_lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0 and _tracing_started_here:
+            tracemalloc.stop()
+            _tracing_started_here = False
+
+
+@dataclass
+class Section:
+    """Timing of one named part of a script run."""
+    name: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    _child_peak: int = field(default=0, repr=False)
+
+
+class RunProfile:
+    """
+    Per-section wall time, rows processed and peak memory of one script run.
+
+    Sections nest: a section opened inside another is named "outer / inner".
+    Peak memory comes from tracemalloc, which traces the whole process, so
+    with several sessions running at once it includes their allocations.
+    `finish` must be called however the run ends (Streamlit interrupts a
+    run on rerun), so that tracing stops once no run needs it.
+    """
+
+    def __init__(self, enabled: bool = False, cprofile: bool = False):
+        self.enabled = enabled
+        self.sections: List[Section] = []
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+        self.cprofile_report: Optional[str] = None
+        self._stack: List[Section] = []
+        self._started = time.perf_counter()
+        self._profiler = cProfile.Profile() if enabled and cprofile else None
+        self._tracing = False
+        self._finished = False
+
+    def start(self) -> "RunProfile":
+        if self.enabled:
+            _acquire_tracemalloc()
+            self._tracing = True
+            tracemalloc.reset_peak()
+            if self._profiler is not None:
+                self._profiler.enable()
+        return self
+
+    @contextmanager
+    def section(self, name: str, rows: Optional[int] = None) -> Iterator[Section]:
+        """
+        Time the enclosed block as a section of the run.
+
+        Args:
+            name: The section name, e.g. a tab or a chart id.
+            rows: Number of rows the section processes, if known up front;
+                it can also be set on the yielded Section.
+
+        Yields:
+            Section: The section record.
+        """
+        record = Section(name, rows=rows)
+        if not self.enabled:
+            yield record
+            return
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            record.name = f"{parent.name} / {name}"
+            parent._child_peak = max(parent._child_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            record.peak_bytes = max(record._child_peak, tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if parent is not None:
+                parent._child_peak = max(parent._child_peak, record.peak_bytes)
+            self.sections.append(record)
+
+    def finish(self) -> "RunProfile":
+        """
+        Stop measuring the run and build the cProfile report, if any.
+
+        Calling it again has no effect.
+        """
+        if not self.enabled or self._finished:
+            return self
+        self._finished = True
+        self.seconds = time.perf_counter() - self._started
+        self.peak_bytes = max([tracemalloc.get_traced_memory()[1]] +
+                              [s.peak_bytes for s in self.sections if s.peak_bytes])
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(CPROFILE_LINES)
+            self.cprofile_report = out.getvalue()
+            self._profiler = None
+        if self._tracing:
+            self._tracing = False
+            _release_tracemalloc()
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The run as JSON-serializable data.
+        """
+        return {
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes,
+            'sections': [
+                {k: v for k, v in asdict(s).items() if not k.startswith('_')}
+                for s in self.sections
+            ],
+            'cprofile': self.cprofile_report,
+        }
+
+
+def start_run(enabled: bool = PROFILE_ENABLED, cprofile: bool = False) -> RunProfile:
+    """
+    Begin profiling the script run of the current thread.
+
+    Args:
+        enabled: Measure the run; when False, sections cost next to nothing.
+        cprofile: Also run cProfile for the whole run.
+
+    Returns:
+        RunProfile: The profile, also returned by `get_run_profile`.
+    """
+    _current.profile = RunProfile(enabled, cprofile).start()
+    return _current.profile
+
+
+def get_run_profile() -> RunProfile:
+    """
+    Returns:
+        RunProfile: The profile of the current run (a disabled one if no
+        run was started in this thread).
+    """
+    profile = getattr(_current, 'profile', None)
+    if profile is None:
+        profile = _current.profile = RunProfile(enabled=False)
+    return profile
+
+
+def section(name: str, rows: Optional[int] = None):
+    """Shortcut for `get_run_profile().section(name, rows)`."""
+    return get_run_profile().section(name, rows)
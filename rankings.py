@@ -0,0 +1,89 @@
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from genres import GenreIndex
+
+# Columns that get a sorted-order index
+RANKED_METRICS = ('Duration', 'Votes', 'Rating')
+
+
+class RankingIndex:
+    """
+    Sorted-order indexes of the unique movies for every ranked metric.
+
+    Each metric is sorted once (descending, rows with a missing value left
+    out), so top-K and bottom-K tables are O(k) slices. Per-genre orders are
+    derived lazily from the global order and the genre bitmask of every
+    movie (a movie of several genres ranks in each of them), and kept for
+    later calls.
+    """
+
+    def __init__(self, df: pd.DataFrame, masks: np.ndarray, genres: pd.Index):
+        self.df = df
+        self.masks = masks
+        self.genres = genres
+        self._order = {
+            metric: self._sorted_positions(df[metric])
+            for metric in RANKED_METRICS if metric in df.columns
+        }
+        self._genre_order = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_genre_index(cls, index: GenreIndex) -> "RankingIndex":
+        """
+        Args:
+            index: The unique movies and their genre masks.
+
+        Returns:
+            RankingIndex: The index; rows are those of `index.movies`.
+        """
+        return cls(index.movies, index.masks, index.genres)
+
+    @staticmethod
+    def _sorted_positions(column: pd.Series) -> np.ndarray:
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        positions = np.flatnonzero(~np.isnan(values))
+        return positions[np.argsort(-values[positions], kind='stable')]
+
+    def order(self, metric: str, genre: Optional[str] = None) -> np.ndarray:
+        """
+        Return row positions sorted by `metric`, highest first.
+
+        Args:
+            metric: One of RANKED_METRICS.
+            genre: Restrict the order to movies of this genre.
+
+        Returns:
+            np.ndarray: Positional indexes into the indexed DataFrame.
+        """
+        order = self._order[metric]
+        if genre is None:
+            return order
+        key = (metric, genre)
+        with self._lock:
+            if key not in self._genre_order:
+                bit = 1 << self.genres.get_loc(genre) if genre in self.genres else 0
+                self._genre_order[key] = order[self.masks[order] & np.uint64(bit) != 0]
+            return self._genre_order[key]
+
+    def top(self, metric: str, k: int = 5, ascending: bool = False,
+            genre: Optional[str] = None) -> pd.DataFrame:
+        """
+        Return the `k` rows with the highest (or lowest) value of `metric`.
+
+        Args:
+            metric: One of RANKED_METRICS.
+            k: Number of rows to return.
+            ascending: Return the lowest values first instead.
+            genre: Restrict the ranking to movies of this genre.
+
+        Returns:
+            pd.DataFrame: The selected rows in ranking order.
+        """
+        order = self.order(metric, genre)
+        positions = order[::-1][:k] if ascending else order[:k]
+        return self.df.iloc[positions]
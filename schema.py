@@ -0,0 +1,183 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+
+# Compact in-memory types of the movie_data columns. Votes and Duration use
+# the nullable integer types so that a missing value stays missing. Titles
+# held as Python objects are interned; a string column (Arrow-backed, the
+# pandas 3 default) is already compact and kept as it is.
+MOVIE_SCHEMA = {
+    'Movie Name': 'object',
+    'Rating': 'float32',
+    'Votes': 'Int32',
+    'Duration': 'Int16',
+    'Genre': 'category',
+}
+
+# The movie_data table as stored in the database
+TABLE_NAME = os.environ.get("IMDB_TABLE", "movie_data")
+# The normalized model: one row per unique movie, plus a movie-genre mapping
+MOVIES_TABLE = os.environ.get("IMDB_MOVIES_TABLE", "movies")
+MOVIE_GENRES_TABLE = os.environ.get("IMDB_MOVIE_GENRES_TABLE", "movie_genres")
+
+
+def movie_columns() -> list:
+    """
+    Returns:
+        list: Fresh Column objects describing a movie_data table.
+    """
+    return [
+        Column('Movie Name', String(255)),
+        Column('Rating', Float),
+        Column('Votes', Integer),
+        Column('Duration', Integer),
+        Column('Genre', String(64)),
+    ]
+
+
+def movie_table_named(name: str) -> Table:
+    """
+    Describe a table shaped like movie_data, without its indexes.
+
+    Args:
+        name: The table name, e.g. a staging table.
+
+    Returns:
+        Table: The table, in a metadata collection of its own.
+    """
+    return Table(name, MetaData(), *movie_columns())
+
+
+def movies_table_named(name: str) -> Table:
+    """
+    Describe a table of unique movies, identified by `movie_id`.
+
+    Args:
+        name: The table name, e.g. a staging table.
+
+    Returns:
+        Table: The table, in a metadata collection of its own.
+    """
+    return Table(
+        name, MetaData(),
+        Column('movie_id', Integer, primary_key=True, autoincrement=True),
+        *[column for column in movie_columns() if column.name != 'Genre'],
+    )
+
+
+def movie_genres_table_named(name: str) -> Table:
+    """
+    Describe the mapping of movies to their genres, one row per pair.
+
+    The primary key leads with Genre so that it also serves the lookup of
+    the movies of a genre.
+
+    Args:
+        name: The table name, e.g. a staging table.
+
+    Returns:
+        Table: The table, in a metadata collection of its own.
+    """
+    return Table(
+        name, MetaData(),
+        Column('Genre', String(64), primary_key=True),
+        Column('movie_id', Integer, primary_key=True, autoincrement=False),
+    )
+
+
+metadata = MetaData()
+movie_table = Table(TABLE_NAME, metadata, *movie_columns())
+movies_table = movies_table_named(MOVIES_TABLE)
+movie_genres_table = movie_genres_table_named(MOVIE_GENRES_TABLE)
+
+
+def intern_strings(column: pd.Series) -> pd.Series:
+    """
+    Return an object column in which equal strings share one interned object.
+
+    Movies appear once per genre, so titles repeat; factorizing first means
+    each distinct title is interned, and stored, only once.
+
+    Args:
+        column: A column of strings, possibly with missing values.
+
+    Returns:
+        pd.Series: The column as object dtype with interned strings.
+    """
+    codes, uniques = pd.factorize(column)
+    interned = np.array([sys.intern(str(value)) for value in uniques] + [None],
+                        dtype=object)
+    return pd.Series(interned.take(codes), index=column.index,
+                     name=column.name, dtype=object)
+
+
+def coerce_movie_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Enforce MOVIE_SCHEMA on movie data, whatever its source.
+
+    Numbers stored as text (e.g. Votes "44e3") are parsed, values that cannot
+    be parsed become missing, and integers are rounded before narrowing.
+    Columns outside the schema are kept unchanged.
+
+    Columns that already have their type are shared with `df`, not copied,
+    so the memory-mapped columns of a snapshot stay mapped. Titles are
+    interned only when held as Python objects; a string column is kept.
+
+    Args:
+        df: Movie data as read from CSV, SQL or a snapshot.
+
+    Returns:
+        pd.DataFrame: The data with the compact column types.
+    """
+    missing = [column for column in MOVIE_SCHEMA if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing movie_data columns: {missing}")
+
+    out = df.copy(deep=False)
+    for column, dtype in MOVIE_SCHEMA.items():
+        values = out[column]
+        if dtype == 'object':
+            if values.dtype == object:
+                out[column] = intern_strings(values)
+        elif values.dtype == dtype:
+            continue
+        elif dtype == 'category':
+            out[column] = values.astype('category')
+        else:
+            if values.dtype == object or pd.api.types.is_string_dtype(values):
+                values = pd.to_numeric(values, errors='coerce')
+            if dtype.startswith('Int'):
+                values = values.round()
+            out[column] = values.astype(dtype, copy=False)
+    return out
+
+
+def memory_report(df: pd.DataFrame) -> pd.Series:
+    """
+    Report the memory used by each column of a DataFrame, in bytes.
+
+    Unlike `memory_usage(deep=True)`, a string object shared by several
+    rows (as interned titles are) is only counted once.
+
+    Args:
+        df: Any DataFrame.
+
+    Returns:
+        pd.Series: Bytes per column, plus the index and a 'Total' entry.
+    """
+    report = {'Index': df.index.memory_usage(deep=True)}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == object:
+            distinct = {id(value): value for value in values.array}
+            report[column] = values.memory_usage(index=False, deep=False) + sum(
+                sys.getsizeof(value) for value in distinct.values()
+            )
+        else:
+            report[column] = values.memory_usage(index=False, deep=True)
+    report = pd.Series(report, name='bytes')
+    report['Total'] = report.sum()
+    return report
@@ -0,0 +1,444 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Lock, Value, util
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
+
+# genre_dataset now lives in checkpoint.py and is still imported from here by the notebook
+from checkpoint import CHECKPOINT_DIR, OUTPUT_DIR, ScrapeCheckpoint, apply_delta, genre_dataset
+from page_parser import (DURATION_XPATH, GENRE_XPATH, MOVIE_LIST_XPATH, YEAR_XPATH,
+                         group_by_genre, save_page)
+
+# List of IMDb genre-specific movie URLs for the year 2024
+GENRE_URLS = [
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=news",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=talk-show",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=game-show",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=war",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=western",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=action",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=comedy",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=drama",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=crime",
+    "https://www.imdb.com/search/title/?title_type=feature&release_date=2024-01-01,2024-12-31&genres=family"
+]
+
+# Location of the "Read More" button (the elements read from the page are located in page_parser.py)
+READ_MORE_XPATH = '//*[@id="__next"]/main/div[2]/div[3]/section/section/div/section/section/div[2]/div/section/div[2]/div[2]/div[2]/div/span/button'
+
+# Counts the movie items matched by an XPath (arguments[0])
+COUNT_ITEMS_JS = """
+return document.evaluate(arguments[0], document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+"""
+
+# Returns name/genre/rating/votes/duration/year of every movie item from index
+# arguments[4] on, with the same fallbacks as the element-by-element extraction
+EXTRACT_MOVIES_JS = """
+const [listXPath, genreXPath, durationXPath, yearXPath, start] = arguments;
+const first = (xpath, context) => document.evaluate(xpath, context, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (node) => node ? node.innerText.trim() : null;
+const items = document.evaluate(listXPath, document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const genre = text(first(genreXPath, document)) || "Unknown";
+const movies = [];
+for (let i = start || 0; i < items.snapshotLength; i++) {
+    const item = items.snapshotItem(i);
+    const title = text(item.querySelector('h3[class="ipc-title__text"]'));
+    if (!title || title.indexOf(". ") < 0) continue;
+    const votes = text(item.querySelector("span[class='ipc-rating-star--voteCount']"));
+    movies.push({
+        "Movie Name": title.split(". ").slice(1).join(". "),
+        "Rating": text(item.querySelector("span[class='ipc-rating-star--rating']")) || "N/A",
+        "Votes": votes ? votes.replace("(", "").replace(")", "").trim() : "N/A",
+        "Duration": text(first(durationXPath, item)) || "N/A",
+        "Genre": genre,
+        "Year": text(first(yearXPath, item))
+    });
+}
+return movies;
+"""
+
+# Number of browsers scraping in parallel
+SCRAPER_WORKERS = int(os.environ.get("IMDB_SCRAPER_WORKERS", "4"))
+# Attempts per genre after the first one fails
+SCRAPER_RETRIES = int(os.environ.get("IMDB_SCRAPER_RETRIES", "2"))
+# Minimum seconds between two page loads, across all workers
+SCRAPER_MIN_INTERVAL = float(os.environ.get("IMDB_SCRAPER_MIN_INTERVAL", "1.0"))
+# Seconds to wait for the page or for new items before giving up
+SCRAPER_TIMEOUT = float(os.environ.get("IMDB_SCRAPER_TIMEOUT", "20"))
+
+
+def create_driver(headless=True):
+    # Configure Chrome, without a visible window unless asked for one
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    # A fixed, large window replaces maximize_window(), which needs a display
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+# Function for scrapping the movie data from website
+def webscrapper(url, driver=None, batch=True, pages_dir=None):
+    # Reuse the given WebDriver, or start (and later quit) a private one
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver()
+
+    try:
+        # Open the IMDb page specified by the URL
+        driver.get(url)
+        # Extract with one script call per page, or with per-element queries (original mode)
+        if batch:
+            genre_data = _scrape_with_script(driver)
+        else:
+            genre_data = _scrape_with_element_queries(driver)
+        if pages_dir is not None:
+            # Keep the expanded page, so that it can be parsed again without a browser (see page_parser.py)
+            save_page(url, driver.page_source, pages_dir)
+        return genre_data
+
+    except Exception as e:
+        # Handle errors that occur while retrieving or processing the page data
+        print(f"Error retrieving movie list: {e}")
+        return {}  # Return an empty dictionary if an error occurs
+
+    finally:
+        if own_driver:
+            driver.quit()  # Quit the WebDriver when finished, ensuring resources are released
+
+
+def _count_items(driver):
+    # Number of movie items currently rendered, counted inside the browser
+    return driver.execute_script(COUNT_ITEMS_JS, MOVIE_LIST_XPATH)
+
+
+def _extract_movies(driver, start=0):
+    # Extract the name, genre, rating, votes, duration and year of the movies from `start` on, in a single round-trip
+    return driver.execute_script(EXTRACT_MOVIES_JS, MOVIE_LIST_XPATH, GENRE_XPATH, DURATION_XPATH, YEAR_XPATH, start)
+
+
+def _wait_for_items(driver, wait):
+    # Wait until the first movies are rendered instead of sleeping a fixed time
+    wait.until(lambda d: _count_items(d) > 0)
+    # Print the title of the page to confirm it loaded correctly
+    print(driver.title)
+
+
+def _click_read_more(driver, wait):
+    # Click the "Read More" button once and wait for the next batch of items; False when there is nothing more to load.
+    # Raises TimeoutException when the next batch does not arrive, so a partly loaded page is never taken as complete
+    while True:
+        buttons = driver.find_elements(By.XPATH, READ_MORE_XPATH)
+        if not buttons:
+            print("No 'Read More' button found. All data loaded.")
+            return False
+        button = buttons[0]
+        count = _count_items(driver)
+        try:
+            # Scroll the button into view and click it as soon as it is clickable
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
+            wait.until(EC.element_to_be_clickable(button)).click()
+            print("Clicked 'Read More' button.")
+            # Continue as soon as new items are rendered or the button is replaced
+            wait.until(lambda d: _count_items(d) > count or EC.staleness_of(button)(d))
+            return True
+        except ElementClickInterceptedException:
+            # If the button is blocked by another element, retry after a short delay
+            print("Button is blocked by another element. Retrying...")
+            time.sleep(0.5)
+        except StaleElementReferenceException:
+            # The button was re-rendered between lookup and click: look it up again
+            continue
+        except TimeoutException:
+            # No new items arrived in time: the page is incomplete, let the caller retry or resume
+            print("Operation timed out while loading more items.")
+            raise
+
+
+def _scrape_with_script(driver, timeout=SCRAPER_TIMEOUT):
+    wait = WebDriverWait(driver, timeout)
+    _wait_for_items(driver, wait)
+
+    # Click the "Read More" button until it disappears, waiting for each batch of items to arrive
+    while _click_read_more(driver, wait):
+        pass
+
+    print("Successfully retrieved all the data.")
+    return group_by_genre(_extract_movies(driver))
+
+
+def scrape_genre_incremental(url, driver=None, refresh=False, output_dir=OUTPUT_DIR,
+                             checkpoint_dir=CHECKPOINT_DIR, timeout=SCRAPER_TIMEOUT,
+                             pages_dir=None):
+    """
+    Scrape one genre page with a checkpoint, keeping only new or changed movies.
+
+    Records are extracted batch by batch as "Read More" loads them and saved
+    with the checkpoint, so after a crash the page is fast-forwarded to the
+    saved item count and scraping continues from there. A completed genre is
+    skipped unless `refresh` is set. At the end, the records are compared
+    with the stored ones by title + year (see checkpoint.apply_delta).
+
+    Unlike `webscrapper`, errors are raised so that callers can retry. A
+    timeout while loading more items is an error too: the checkpoint is left
+    incomplete and the next attempt resumes from it.
+
+    Args:
+        url: The genre page to scrape.
+        driver: A WebDriver to reuse; a private one is started if None.
+        refresh: Scrape the page again even if its checkpoint is completed.
+        output_dir: Folder of the genre CSV files.
+        checkpoint_dir: Folder of the checkpoints and key stores.
+        timeout: Seconds to wait for the page or for new items.
+        pages_dir: Also save the expanded page HTML in this folder.
+
+    Returns:
+        dict: The new or changed records, grouped by genre.
+    """
+    checkpoint = ScrapeCheckpoint.load(url, checkpoint_dir)
+    if checkpoint.completed:
+        if not refresh:
+            print(f"Skipping {url}: completed at {time.ctime(checkpoint.updated_at)}")
+            return {}
+        checkpoint.restart()
+    elif checkpoint.items_loaded:
+        print(f"Resuming {url} from {checkpoint.items_loaded} items")
+
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver()
+    try:
+        wait = WebDriverWait(driver, timeout)
+        driver.get(url)
+        _wait_for_items(driver, wait)
+
+        # Fast-forward: load the items already saved by an interrupted run without extracting them
+        while _count_items(driver) < checkpoint.items_loaded and _click_read_more(driver, wait):
+            pass
+
+        while True:
+            # Save the items loaded since the last checkpoint, then ask for more
+            count = _count_items(driver)
+            if count > checkpoint.items_loaded:
+                checkpoint.append_records(_extract_movies(driver, checkpoint.items_loaded), count)
+            if not _click_read_more(driver, wait):
+                break
+            checkpoint.clicks += 1
+        if pages_dir is not None:
+            save_page(url, driver.page_source, pages_dir)
+
+        deltas = apply_delta(group_by_genre(checkpoint.read_records()), output_dir, checkpoint_dir)
+        checkpoint.finish()
+        return deltas
+    finally:
+        if own_driver:
+            driver.quit()
+
+
+def _scrape_with_element_queries(driver):
+    # Wait for 2 seconds to ensure the page is fully loaded
+    time.sleep(2)
+    # Print the title of the page to confirm it loaded correctly
+    print(driver.title)
+
+    # Attempt to click the "Read More" button to load all the data dynamically
+    while True:
+        try:
+            # Locate the "Read More" button using its XPath
+            element = driver.find_element(By.XPATH, READ_MORE_XPATH)
+            # Scroll the button into view if it's not currently visible
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            # Wait for 1 second to ensure the button is visible
+            time.sleep(1)
+            # Click the "Read More" button to load more content
+            element.click()
+            # Print a message when the button is clicked
+            print("Clicked 'Read More' button.")
+            # Wait for 1 second before trying again
+            time.sleep(1)
+        except NoSuchElementException:
+            # Exit loop if the "Read More" button is no longer available (all data is loaded)
+            print("No 'Read More' button found. All data loaded.")
+            break
+        except ElementClickInterceptedException:
+            # If the button is blocked by another element, retry after a short delay
+            print("Button is blocked by another element. Retrying...")
+            time.sleep(2)
+        except TimeoutException:
+            # Handle cases where the operation times out and retry
+            print("Operation timed out. Retrying...")
+            time.sleep(2)
+        except Exception as e:
+            # Catch any other unexpected errors
+            print(f"Unexpected error: {e}")
+            break
+
+    print("Successfully retrieved all the data.")
+
+    # Initialize a dictionary to store movie data categorized by genre
+    genre_data = {}
+
+    # Locate all movie items on the page
+    movies = driver.find_elements(By.XPATH,MOVIE_LIST_XPATH)
+
+    # Extract details for each movie
+    for movie in movies:
+        try:
+            # Extract the movie name, ensuring it splits correctly to remove unnecessary text
+            name = movie.find_element(By.CSS_SELECTOR, 'h3[class="ipc-title__text"]').text.split(". ", 1)[1]
+
+            # Attempt to extract the genre of the movie, using a fallback if not found
+            try:
+                genre = movie.find_element(By.XPATH, GENRE_XPATH).text.strip()
+            except NoSuchElementException:
+                genre = "Unknown" # If no genre is found, mark it as "Unknown"
+
+            # Extract movie rating, handling cases where it's missing
+            try:
+                rating = movie.find_element(By.CSS_SELECTOR, "span[class='ipc-rating-star--rating']").text.strip()
+            except NoSuchElementException:
+                rating = "N/A" # If no votes are found, mark it as "N/A"
+
+            # Extract vote count, formatting it correctly and handling missing data
+            try:
+                votes = movie.find_element(By.CSS_SELECTOR, "span[class='ipc-rating-star--voteCount']").text.replace("(", "").replace(")", "").strip()
+            except NoSuchElementException:
+                votes = "N/A" # If no votes are found, mark it as "N/A"
+
+            # Extract movie duration, using a fallback if not found
+            try:
+                duration = movie.find_element(By.XPATH, DURATION_XPATH).text.strip()
+            except NoSuchElementException:
+                duration = "N/A" # If no votes are found, mark it as "N/A"
+
+            # Split the genre(s) into a list and store movie data in a dictionary under each genre
+            for g in genre.split(", "):
+                if g not in genre_data:
+                    genre_data[g] = []  # Initialize an empty list for new genres
+                # Append movie details to the respective genre's list
+                genre_data[g].append({
+                    "Movie Name": name,
+                    "Rating": rating,
+                    "Votes": votes,
+                    "Duration": duration,
+                    "Genre": genre
+                })
+        except Exception as e:
+            # Handle errors that may occur while processing individual movies
+            print(f"Error processing movie: {e}")
+
+    return genre_data  # Return the dictionary containing movie data organized by genre
+
+
+# State of each worker process: its browser and the shared rate limit
+_worker = {}
+
+
+def _init_worker(lock, next_slot, min_interval, headless):
+    # Remember the shared rate limit; the browser is started on first use
+    _worker.update(lock=lock, next_slot=next_slot,
+                   min_interval=min_interval, headless=headless, driver=None)
+
+
+def _wait_for_slot():
+    # Reserve the next page-load slot across all workers, then wait for it
+    with _worker['lock']:
+        now = time.time()
+        slot = max(now, _worker['next_slot'].value)
+        _worker['next_slot'].value = slot + _worker['min_interval']
+    time.sleep(max(0.0, slot - now))
+
+
+def _worker_driver():
+    # Start this worker's browser once and quit it when the process exits
+    if _worker['driver'] is None:
+        driver = create_driver(_worker['headless'])
+        _worker['driver'] = driver
+        _worker['finalizer'] = util.Finalize(driver, driver.quit, exitpriority=10)
+    return _worker['driver']
+
+
+def _reset_worker_driver():
+    # Throw away a browser that may be broken, so the next attempt starts fresh
+    if _worker['driver'] is not None:
+        _worker['finalizer']()
+        _worker['driver'] = None
+
+
+def _scrape_task(url, retries, incremental, refresh, pages_dir):
+    # Scrape one genre page, retrying with a fresh browser on failure
+    for attempt in range(retries + 1):
+        _wait_for_slot()
+        try:
+            if incremental:
+                # Resumes from the checkpoint saved by a failed attempt; an empty delta is a success
+                return scrape_genre_incremental(url, _worker_driver(), refresh=refresh,
+                                                pages_dir=pages_dir)
+            genre_data = webscrapper(url, _worker_driver(), pages_dir=pages_dir)
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            genre_data = {}
+        if genre_data:
+            return genre_data
+        print(f"Attempt {attempt + 1} failed for {url}")
+        _reset_worker_driver()
+        time.sleep(2 ** attempt)
+    return {}
+
+
+def scrape_genres(urls=GENRE_URLS, workers=SCRAPER_WORKERS, retries=SCRAPER_RETRIES,
+                  min_interval=SCRAPER_MIN_INTERVAL, headless=True, incremental=False,
+                  refresh=False, pages_dir=None):
+    """
+    Scrape several genre pages concurrently with a pool of reusable browsers.
+
+    Each worker process keeps one headless browser for all the pages it is
+    given, retries a failed page with a fresh browser, and all workers share
+    a global limit of one page load per `min_interval` seconds.
+
+    Args:
+        urls: The genre pages to scrape (IMDb or locally served copies).
+        workers: Maximum number of browser processes.
+        retries: Extra attempts per page after a failure.
+        min_interval: Minimum seconds between two page loads overall.
+        headless: Run the browsers without a window.
+        incremental: Use `scrape_genre_incremental`: resume from checkpoints,
+            skip completed genres and return only new or changed movies.
+        refresh: In incremental mode, scrape completed genres again.
+        pages_dir: Also save every expanded page in this folder (e.g.
+            page_parser.PAGES_DIR), to parse it again later without a
+            browser with `page_parser.parse_pages`.
+
+    Returns:
+        dict: For each URL, the genre data returned by `webscrapper`, or the
+        delta returned by `scrape_genre_incremental` (empty if every attempt
+        failed).
+    """
+    results = {}
+    if not urls:
+        return results
+    lock, next_slot = Lock(), Value('d', 0.0, lock=False)
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(urls))),
+        initializer=_init_worker,
+        initargs=(lock, next_slot, min_interval, headless)
+    ) as pool:
+        futures = {pool.submit(_scrape_task, url, retries, incremental, refresh, pages_dir): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                # A crashed worker only loses its own page
+                print(f"Error processing {url}: {e}")
+                results[url] = {}
+            print(f"URL Processed: {url}")
+    return results
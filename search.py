@@ -0,0 +1,246 @@
+import os
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import Index, and_, func, inspect, or_, select
+from sqlalchemy.engine import Connection, Engine
+
+from schema import movie_genres_table, movies_table
+from title_search import normalize_title
+
+# Rows returned per page by the database search
+PAGE_SIZE = int(os.environ.get("IMDB_PAGE_SIZE", "50"))
+
+# Keyset order: most voted first, ties broken by rating, then by name and
+# movie_id so that every movie has a unique position.
+KEYSET_COLUMNS = ('Votes', 'Rating', 'Movie Name', 'movie_id')
+# Columns of a result page, as in the in-memory search
+RESULT_COLUMNS = ('Movie Name', 'Rating', 'Votes', 'Duration', 'Genre')
+
+# The genre lookup is served by the primary key of movie_genres (Genre, movie_id)
+SEARCH_INDEXES = (
+    Index('ix_movies_votes_rating',
+          movies_table.c['Votes'], movies_table.c['Rating']),
+)
+
+# Per database: the data version last inspected, with the tables and
+# indexes found missing then
+_inspected = {}
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """
+    The Advanced Title Search form values, as inclusive ranges.
+
+    `match` is 'any' for movies with at least one of `genres`, or 'all' for
+    movies with every one of them. `title` (normalized, see
+    `normalize_title`) keeps the movies whose name contains all its words.
+    """
+    genres: Tuple[str, ...]
+    rating: Tuple[float, float]
+    duration: Tuple[int, int]
+    votes: Tuple[int, int]
+    match: str = 'any'
+    title: str = ''
+
+    @classmethod
+    def from_form(cls, genres: Sequence[str], rating: tuple,
+                  duration: tuple, votes: tuple,
+                  match: str = 'any', title: str = '') -> "SearchFilters":
+        """
+        Build filters from widget values, converting NumPy scalars to Python.
+
+        Returns:
+            SearchFilters: Filters safe to use as SQL bind parameters.
+        """
+        return cls(
+            genres=tuple(str(g) for g in genres),
+            # Through str: float(np.float32(7.4)) is 7.400000095, above the stored 7.4
+            rating=(float(str(rating[0])), float(str(rating[1]))),
+            duration=(int(duration[0]), int(duration[1])),
+            votes=(int(votes[0]), int(votes[1])),
+            match=match,
+            title=normalize_title(title),
+        )
+
+
+def ensure_search_indexes(engine: Engine) -> None:
+    """
+    Create the indexes backing the search query if they do not exist yet.
+
+    This is DDL, possibly long and blocking on a large table, so it is run
+    by the loader after a load, never while serving a search.
+
+    Args:
+        engine: The engine connected to the movie database.
+    """
+    for index in SEARCH_INDEXES:
+        index.create(bind=engine, checkfirst=True)
+    _inspected.pop(engine.url, None)
+
+
+def _inspect_search_schema(engine: Engine, version: Hashable) -> tuple:
+    # The tables and indexes of the search missing from the database, checked once per data version
+    inspected = _inspected.get(engine.url)
+    if inspected is None or inspected[0] != version:
+        inspector = inspect(engine)
+        tables = [table.name for table in (movies_table, movie_genres_table)
+                  if not inspector.has_table(table.name)]
+        indexes = []
+        if not tables:
+            present = {found['name'] for table in {index.table.name for index in SEARCH_INDEXES}
+                       for found in inspector.get_indexes(table)}
+            indexes = [index.name for index in SEARCH_INDEXES if index.name not in present]
+        inspected = _inspected[engine.url] = (version, tables, indexes)
+    return inspected[1:]
+
+
+def has_search_tables(engine: Engine, version: Hashable) -> bool:
+    """
+    Check that the database has the normalized tables the search runs on.
+
+    A movie_data table loaded without the pipeline (e.g. with to_sql) has
+    none; the search is then left to the in-memory filters.
+
+    Args:
+        engine: The engine connected to the movie database.
+        version: The current data version (see DataLayer.version); the
+            database is inspected again when it changes.
+
+    Returns:
+        bool: True when the movies and movie_genres tables exist.
+    """
+    return not _inspect_search_schema(engine, version)[0]
+
+
+def missing_search_indexes(engine: Engine, version: Hashable) -> list:
+    """
+    List the search indexes the database lacks, without creating them.
+
+    Args:
+        engine: The engine connected to the movie database.
+        version: The current data version; the database is inspected
+            again when it changes, e.g. after the loader created them.
+
+    Returns:
+        list: Names of the missing indexes; empty when all exist.
+    """
+    return _inspect_search_schema(engine, version)[1]
+
+
+def _after_clause(cursor: tuple):
+    """
+    Build the keyset predicate "row comes after `cursor`" in KEYSET order.
+
+    The predicate is expanded into OR/AND terms rather than a row-value
+    comparison so that it stays portable and index-friendly.
+    """
+    cols = [movies_table.c[name] for name in KEYSET_COLUMNS]
+    terms = []
+    for i, col in enumerate(cols):
+        equal_prefix = [cols[j] == cursor[j] for j in range(i)]
+        terms.append(and_(*equal_prefix, col < cursor[i]))
+    return or_(*terms)
+
+
+def _genre_clause(filters: SearchFilters):
+    """
+    Build the genre predicate of the search on the unique movies.
+
+    movie_genres has one row per movie and genre: a movie matches 'any'
+    when one of its rows is a selected genre, and 'all' when it has a row
+    for every selected genre. Either way it is listed once.
+    """
+    links = movie_genres_table
+    genres = sorted(set(filters.genres))
+    matching = select(links.c['movie_id']).where(links.c['Genre'].in_(genres))
+    if filters.match == 'all' and len(genres) > 1:
+        matching = matching.group_by(links.c['movie_id']).having(func.count() == len(genres))
+    return movies_table.c['movie_id'].in_(matching)
+
+
+def _title_clause(filters: SearchFilters):
+    """
+    Build the title predicate of the search: every query word, with case
+    and punctuation ignored, appears in the name. Unlike the in-memory
+    TitleIndex, this neither folds accents nor forgives misspellings.
+    """
+    name = movies_table.c['Movie Name']
+    return and_(*[name.ilike(f"%{word}%") for word in filters.title.split()])
+
+
+def build_search_query(filters: SearchFilters, after: Optional[tuple] = None,
+                       limit: int = PAGE_SIZE):
+    """
+    Compile the search filters into a parameterized, keyset-paginated query
+    over the unique movies (see schema.movies_table_named).
+
+    Args:
+        filters: The ranges and genres to filter on.
+        after: The keyset cursor of the last row of the previous page.
+        limit: Maximum number of rows to return.
+
+    Returns:
+        Select: The SQLAlchemy statement.
+    """
+    c = movies_table.c
+    stmt = select(movies_table).where(
+        _genre_clause(filters),
+        c['Rating'].between(*filters.rating),
+        c['Duration'].between(*filters.duration),
+        c['Votes'].between(*filters.votes),
+    )
+    if filters.title:
+        stmt = stmt.where(_title_clause(filters))
+    if after is not None:
+        stmt = stmt.where(_after_clause(after))
+    return stmt.order_by(*[c[name].desc() for name in KEYSET_COLUMNS]).limit(limit)
+
+
+def _genre_labels(conn: Connection, movie_ids: list) -> pd.Series:
+    # The genres of the movies of one page, as "Action, Drama" like GenreIndex.labels
+    links = movie_genres_table
+    rows = pd.read_sql(
+        select(links.c['movie_id'], links.c['Genre'])
+        .where(links.c['movie_id'].in_(movie_ids)).order_by(links.c['Genre']),
+        conn
+    )
+    return rows.groupby('movie_id')['Genre'].agg(', '.join)
+
+
+def fetch_page(engine: Engine, filters: SearchFilters,
+               after: Optional[tuple] = None,
+               page_size: int = PAGE_SIZE) -> Tuple[pd.DataFrame, Optional[tuple]]:
+    """
+    Run one page of the search against the database.
+
+    Every movie is listed once, with all its genres, as in the in-memory
+    search.
+
+    Args:
+        engine: The pooled engine connected to the movie database.
+        filters: The ranges and genres to filter on.
+        after: The cursor returned with the previous page, or None.
+        page_size: Number of rows per page.
+
+    Returns:
+        tuple: The page as a DataFrame and the cursor of the next page
+        (None when this is the last page).
+    """
+    if not filters.genres:
+        return pd.DataFrame(columns=list(RESULT_COLUMNS)), None
+    stmt = build_search_query(filters, after, page_size + 1)
+    with engine.connect() as conn:
+        rows = pd.read_sql(stmt, conn)
+        page = rows.iloc[:page_size].copy()
+        page['Genre'] = page['movie_id'].map(_genre_labels(conn, page['movie_id'].tolist()))
+    cursor = None
+    if len(rows) > page_size:
+        last = page.iloc[-1]
+        cursor = tuple(
+            last[name].item() if hasattr(last[name], 'item') else last[name]
+            for name in KEYSET_COLUMNS
+        )
+    return page[list(RESULT_COLUMNS)], cursor
@@ -0,0 +1,76 @@
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from schema import coerce_movie_data
+
+# Default location of the columnar snapshot of movie_data
+SNAPSHOT_PATH = os.environ.get("IMDB_SNAPSHOT_PATH", "movie_data.arrow")
+
+
+def write_snapshot(df: pd.DataFrame, path: str = SNAPSHOT_PATH) -> None:
+    """
+    Write movie data to an uncompressed Arrow IPC (Feather v2) file.
+
+    The data is coerced to MOVIE_SCHEMA first, so the snapshot stores the
+    compact column types (dictionary-encoded Genre, 32/16-bit numbers).
+
+    The file is written next to its destination and moved into place, so
+    readers never see a partial snapshot and already mapped copies stay
+    valid. Compression is disabled because compressed buffers cannot be
+    memory-mapped without decoding.
+
+    Args:
+        df: The movie data.
+        path: Destination of the snapshot.
+    """
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(coerce_movie_data(df), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH) -> pd.DataFrame:
+    """
+    Open a snapshot memory-mapped and convert it to a DataFrame.
+
+    Numeric columns without nulls are handed to pandas as views on the
+    mapped pages (no copy, shared between processes by the OS page cache);
+    only string columns are materialised.
+
+    Args:
+        path: Location of the snapshot.
+
+    Returns:
+        pd.DataFrame: The movie data.
+    """
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def snapshot_version(path: str = SNAPSHOT_PATH) -> tuple:
+    """
+    Return a cheap version identifier for a snapshot file.
+
+    Args:
+        path: Location of the snapshot.
+
+    Returns:
+        tuple: The file's modification time (ns) and size.
+    """
+    stat = os.stat(path)
+    return ('snapshot', stat.st_mtime_ns, stat.st_size)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Build a movie_data snapshot from a cleaned CSV file."
+    )
+    parser.add_argument('csv', nargs='?', default='genre_df_cleaned.csv')
+    parser.add_argument('snapshot', nargs='?', default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+    write_snapshot(pd.read_csv(args.csv), args.snapshot)
+    print(f"Saved snapshot of '{args.csv}' to '{args.snapshot}'")
@@ -0,0 +1,261 @@
+import os
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Maximum number of titles returned by one lookup
+TITLE_SEARCH_LIMIT = int(os.environ.get("IMDB_TITLE_SEARCH_LIMIT", "100"))
+# Minimum trigram similarity (shared / all trigrams) for a title word to
+# count as a misspelling of a query word
+FUZZY_THRESHOLD = float(os.environ.get("IMDB_FUZZY_THRESHOLD", "0.45"))
+# Prefixes up to this length match so many words that the ranks of their
+# titles are merged once when the index is built, not on every keystroke
+SHORT_PREFIX = 3
+
+# Byte table turning every ASCII character but letters and digits into a space
+_ASCII_WORDS = bytes(c if chr(c).isalnum() else ord(' ') for c in range(256))
+# Sorts after every string starting with a given prefix
+_PREFIX_END = '\U0010ffff'
+
+
+def _fold(ch: str) -> str:
+    # Accented Latin letters lose their accents; other scripts are kept as
+    # they are, since their combining marks are part of the letters
+    base = ''.join(c for c in unicodedata.normalize('NFKD', ch) if not unicodedata.combining(c))
+    if base and base.isascii():
+        return base.encode('ascii').translate(_ASCII_WORDS).decode('ascii')
+    return ch if ch.isalnum() or unicodedata.category(ch).startswith('M') else ' '
+
+
+def normalize_title(title: str) -> str:
+    """
+    Case-fold a title, strip accents and punctuation, and collapse spaces.
+
+    Args:
+        title: A movie title, e.g. 'Amélie: The Return'.
+
+    Returns:
+        str: The normalized title, e.g. 'amelie the return'.
+    """
+    text = str(title).casefold()
+    if text.isascii():
+        text = text.encode('ascii').translate(_ASCII_WORDS).decode('ascii')
+    else:
+        text = ''.join(_fold(ch) for ch in text)
+    return ' '.join(text.split())
+
+
+def _trigrams(word: str) -> set:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+def _postings(codes: np.ndarray, ranks: np.ndarray, groups: int) -> tuple:
+    """
+    Group ranks by code, each group sorted and without repeats.
+
+    Returns:
+        tuple: The start of every group (and the end of the last one) and
+        the grouped ranks.
+    """
+    # One sort of (code, rank) packed in a single integer
+    keys = _sorted_unique(codes.astype(np.int64) << 32 | ranks.astype(np.int64))
+    codes, ranks = keys >> 32, (keys & 0xFFFFFFFF).astype(np.int32)
+    return np.searchsorted(codes, np.arange(groups + 1)), ranks
+
+
+def _contains(runs: List[np.ndarray], candidates: np.ndarray) -> np.ndarray:
+    # Which candidates are in any of the sorted `runs`
+    found = np.zeros(len(candidates), dtype=bool)
+    for ranks in runs:
+        if len(ranks):
+            at = np.minimum(np.searchsorted(ranks, candidates), len(ranks) - 1)
+            found |= ranks[at] == candidates
+    return found
+
+
+class TitleIndex:
+    """
+    Word-prefix and fuzzy search over movie titles, ranked by votes.
+
+    Titles are normalized and split into words. Every word of the sorted
+    word list maps to the sorted ranks (positions by descending votes) of
+    the titles containing it, stored back to back in word order, so the
+    lowest ranks are the most voted titles and the words sharing a prefix
+    are found with two binary searches. Short prefixes, shared by many
+    words, get the same layout of their own. A lookup walks the ranks of
+    its rarest word in order and binary searches those of the other words,
+    stopping once enough titles are found.
+
+    A query word can also match a misspelt title word through a trigram
+    index over the word list, which is built on the first fuzzy lookup.
+    """
+
+    def __init__(self, titles: pd.Series, votes: pd.Series):
+        votes = votes.to_numpy(dtype='float64', na_value=-1.0)
+        # Rank r is the r-th most voted title; order maps ranks to positions
+        self.order = np.argsort(-votes, kind='stable')
+
+        # Every distinct title is normalized and split once
+        codes, uniques = pd.factorize(titles.fillna('').to_numpy(dtype=object)[self.order])
+        normalized = [normalize_title(t) for t in uniques]
+        lengths = np.array([t.count(' ') + 1 if t else 0 for t in normalized], dtype=np.int64)
+        words = np.array(' '.join(normalized).split(), dtype=object)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        counts = lengths[codes]
+        ranks = np.repeat(np.arange(len(codes), dtype=np.int32), counts)
+        offsets = np.arange(len(ranks)) - np.repeat(np.cumsum(counts) - counts, counts)
+        word_codes, vocab = pd.factorize(words[starts[codes][ranks] + offsets], sort=True)
+
+        self.vocab: List[str] = list(vocab)
+        self.offsets, self.postings = _postings(word_codes, ranks, len(self.vocab))
+        # The same layout per short prefix, merging the ranks of its words once
+        word_codes = np.repeat(np.arange(len(self.vocab)), np.diff(self.offsets))
+        self._short_prefixes = []
+        for length in range(1, SHORT_PREFIX + 1):
+            prefix_codes, prefixes = pd.factorize(pd.Series(vocab).str[:length], sort=True)
+            offsets, postings = _postings(prefix_codes[word_codes], self.postings, len(prefixes))
+            self._short_prefixes.append((list(prefixes), offsets, postings))
+        self._trigram_index = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_movies(cls, movies: pd.DataFrame) -> "TitleIndex":
+        """
+        Args:
+            movies: Movies with 'Movie Name' and 'Votes' columns.
+
+        Returns:
+            TitleIndex: The index; lookups return positions into `movies`.
+        """
+        return cls(movies['Movie Name'], movies['Votes'])
+
+    def _prefix_words(self, prefix: str) -> np.ndarray:
+        # Ids of the words starting with `prefix`
+        lo = bisect_left(self.vocab, prefix)
+        return np.arange(lo, bisect_left(self.vocab, prefix + _PREFIX_END, lo))
+
+    def _runs(self, words: np.ndarray) -> List[np.ndarray]:
+        # The sorted ranks of the titles containing each of `words`
+        return [self.postings[self.offsets[w]:self.offsets[w + 1]] for w in words]
+
+    def _word_runs(self, word: str) -> List[np.ndarray]:
+        at = bisect_left(self.vocab, word)
+        found = at < len(self.vocab) and self.vocab[at] == word
+        return self._runs(range(at, at + found))
+
+    def _prefix_runs(self, prefix: str) -> List[np.ndarray]:
+        if len(prefix) > SHORT_PREFIX:
+            return self._runs(self._prefix_words(prefix))
+        prefixes, offsets, ranks = self._short_prefixes[len(prefix) - 1]
+        at = bisect_left(prefixes, prefix)
+        if at < len(prefixes) and prefixes[at] == prefix:
+            return [ranks[offsets[at]:offsets[at + 1]]]
+        return []
+
+    def _trigrams_of_vocab(self) -> tuple:
+        with self._lock:
+            if self._trigram_index is None:
+                gram_ids = {}
+                grams, words, counts = [], [], []
+                for word_id, word in enumerate(self.vocab):
+                    word_grams = _trigrams(word)
+                    counts.append(len(word_grams))
+                    for gram in word_grams:
+                        grams.append(gram_ids.setdefault(gram, len(gram_ids)))
+                        words.append(word_id)
+                grams = np.array(grams, dtype=np.int64)
+                order = np.argsort(grams, kind='stable')
+                self._trigram_index = (
+                    gram_ids,
+                    np.searchsorted(grams[order], np.arange(len(gram_ids) + 1)),
+                    np.array(words, dtype=np.int64)[order],
+                    np.array(counts, dtype=np.int64),
+                )
+            return self._trigram_index
+
+    def similar_words(self, word: str) -> np.ndarray:
+        """
+        Find the title words that look like a (possibly misspelt) word.
+
+        Args:
+            word: A normalized query word.
+
+        Returns:
+            np.ndarray: Ids of the similar words in `vocab`.
+        """
+        gram_ids, offsets, words, counts = self._trigrams_of_vocab()
+        query = [gram_ids[g] for g in _trigrams(word) if g in gram_ids]
+        if not query:
+            return np.array([], dtype=np.int64)
+        candidates = np.concatenate([words[offsets[g]:offsets[g + 1]] for g in query])
+        candidates, shared = np.unique(candidates, return_counts=True)
+        similarity = shared / (len(_trigrams(word)) + counts[candidates] - shared)
+        return candidates[similarity >= FUZZY_THRESHOLD]
+
+    def _match(self, run_sets: List[List[np.ndarray]], mask: Optional[np.ndarray],
+               limit: int) -> np.ndarray:
+        # The lowest ranks found in a run of every set and allowed by the
+        # mask. The rarest set, merged into one sorted run, is checked in
+        # growing blocks until `limit` titles are found.
+        run_sets = sorted(run_sets, key=lambda runs: sum(map(len, runs)))
+        first, others = run_sets[0], run_sets[1:]
+        first = first[0] if len(first) == 1 else _sorted_unique(
+            np.concatenate(first + [self.postings[:0]]))
+        found, start, step = [], 0, 4 * limit
+        while start < len(first) and sum(map(len, found)) < limit:
+            block = first[start:start + step]
+            if mask is not None:
+                block = block[mask[self.order[block]]]
+            for runs in others:
+                block = block[_contains(runs, block)]
+            found.append(block)
+            start, step = start + step, 2 * step
+        return np.concatenate(found + [first[:0]])[:limit]
+
+    def search(self, query: str, limit: int = TITLE_SEARCH_LIMIT,
+               mask: Optional[np.ndarray] = None, fuzzy: bool = True) -> np.ndarray:
+        """
+        Find the titles matching every word of `query`, most voted first.
+
+        Query words match whole title words, except the last one, which
+        may still be being typed and matches the words it begins: 'dune
+        par' finds 'Dune: Part Two'. Titles matching that way come first;
+        when there are fewer than `limit` of them, titles matching
+        misspelt words ('gladiatr') follow.
+
+        Args:
+            query: The text typed by the user.
+            limit: Maximum number of titles to return.
+            mask: Boolean array over the indexed titles, e.g. the other
+                search filters; titles where it is False are left out.
+            fuzzy: Also match misspelt words.
+
+        Returns:
+            np.ndarray: Positions of the matching titles in the indexed data.
+        """
+        words = normalize_title(query).split()
+        if not words or limit <= 0:
+            return np.array([], dtype=np.int64)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+
+        exact = [self._word_runs(w) for w in words[:-1]] + [self._prefix_runs(words[-1])]
+        ranks = self._match(exact, mask, limit)
+        if fuzzy and len(ranks) < limit:
+            loose = [runs + self._runs(self.similar_words(word))
+                     for runs, word in zip(exact, words)]
+            loose = self._match(loose, mask, limit)
+            ranks = np.concatenate([ranks, loose[~np.isin(loose, ranks)][:limit - len(ranks)]])
+        return self.order[ranks]